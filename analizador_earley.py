@@ -0,0 +1,184 @@
+from typing import Dict, List, Optional, Set, Tuple, Union
+from analizador_gramatica import Produccion
+from clasificador import _explicar_libre_contexto, analizar_gramatica
+from gramatica_compilada import GramaticaCompilada, compilar_gramatica
+
+Item = Tuple[int, int, int]
+Nodo = Tuple
+
+
+def _anulables(izquierdas: List[str], derechas: List[Tuple[str, ...]]) -> Set[str]:
+    anulables: Set[str] = set()
+    cambio = True
+    while cambio:
+        cambio = False
+        for izquierda, derecha in zip(izquierdas, derechas):
+            if izquierda not in anulables and all(c in anulables for c in derecha):
+                anulables.add(izquierda)
+                cambio = True
+    return anulables
+
+
+class BosqueAnalisis:
+    def __init__(self, parser: "ParserEarley", cadena: str, conjuntos: List[Set[Item]], completos: List[Set[Tuple[str, int]]]):
+        self.parser = parser
+        self.cadena = cadena
+        self.raiz: Nodo = ("sym", parser.simbolo_inicial, 0, len(cadena))
+        self._conjuntos = conjuntos
+        self._completos = completos
+        self._familias: Dict[Nodo, List[Tuple[Nodo, ...]]] = {}
+
+    def familias(self, nodo: Nodo) -> List[Tuple[Nodo, ...]]:
+        if nodo in self._familias:
+            return self._familias[nodo]
+        res: List[Tuple[Nodo, ...]] = []
+        if nodo[0] == "sym":
+            _, A, i, j = nodo
+            for p in self.parser.por_izquierda.get(A, []):
+                k = len(self.parser.derechas[p])
+                if (p, k, i) in self._conjuntos[j]:
+                    res.append((("item", p, k, i, j),))
+        elif nodo[0] == "item":
+            _, p, k, i, j = nodo
+            if k > 0:
+                X = self.parser.derechas[p][k - 1]
+                for m in range(i, j + 1):
+                    if (p, k - 1, i) not in self._conjuntos[m]:
+                        continue
+                    if X in self.parser.no_terminales:
+                        if (X, m) in self._completos[j]:
+                            res.append((("item", p, k - 1, i, m), ("sym", X, m, j)))
+                    elif m == j - 1 and self.cadena[m] == X:
+                        res.append((("item", p, k - 1, i, m), ("t", X, m)))
+        self._familias[nodo] = res
+        return res
+
+    def nodos(self) -> Dict[Nodo, List[Tuple[Nodo, ...]]]:
+        pila = [self.raiz]
+        vistos = {self.raiz}
+        while pila:
+            nodo = pila.pop()
+            for familia in self.familias(nodo):
+                for hijo in familia:
+                    if hijo not in vistos:
+                        vistos.add(hijo)
+                        pila.append(hijo)
+        return {n: self._familias.get(n, []) for n in vistos}
+
+    def arbol(self):
+        return self._arbol_simbolo(self.raiz, set())
+
+    def _arbol_simbolo(self, nodo: Nodo, en_curso: Set[Nodo]):
+        if nodo[0] == "t":
+            return nodo[1]
+        en_curso = en_curso | {nodo}
+        for (item,) in self.familias(nodo):
+            hijos = self._hijos_item(item, en_curso)
+            if hijos is not None:
+                return (nodo[1], hijos)
+        return None
+
+    def _hijos_item(self, item: Nodo, en_curso: Set[Nodo]):
+        if item[2] == 0:
+            return []
+        for previo, ultimo in self.familias(item):
+            if ultimo in en_curso:
+                continue
+            hijo = self._arbol_simbolo(ultimo, en_curso)
+            if hijo is None:
+                continue
+            resto = self._hijos_item(previo, en_curso)
+            if resto is not None:
+                return resto + [hijo]
+        return None
+
+
+class ParserEarley:
+    def __init__(self, producciones: Union[List[Produccion], GramaticaCompilada], simbolo_inicial: Optional[str] = None):
+        gramatica = compilar_gramatica(producciones)
+        analisis = analizar_gramatica(gramatica)
+        if analisis.violacion_libre is not None:
+            razones = _explicar_libre_contexto(analisis)
+            raise ValueError("El analizador Earley requiere una gramatica libre de contexto:\n" + "\n".join(razones))
+        nombres = gramatica.nombres
+        self.gramatica = gramatica
+        self.simbolo_inicial = simbolo_inicial or gramatica.texto(gramatica.inicial)
+        self.no_terminales = {n for n, nt in zip(nombres, gramatica.no_terminal) if nt}
+        self.izquierdas = [nombres[p.izquierda[0]] for p in gramatica.producciones]
+        self.derechas = [tuple(nombres[x] for x in p.derecha) for p in gramatica.producciones]
+        self.por_izquierda: Dict[str, List[int]] = {}
+        for idx, izquierda in enumerate(self.izquierdas):
+            self.por_izquierda.setdefault(izquierda, []).append(idx)
+        self.anulables = _anulables(self.izquierdas, self.derechas)
+
+    def _tabla(self, cadena: str):
+        n = len(cadena)
+        derechas = self.derechas
+        izquierdas = self.izquierdas
+        por_izquierda = self.por_izquierda
+        anulables = self.anulables
+        no_terminales = self.no_terminales
+        conjuntos: List[Set[Item]] = [set() for _ in range(n + 1)]
+        completos: List[Set[Tuple[str, int]]] = [set() for _ in range(n + 1)]
+        esperando: List[Dict[str, List[Item]]] = [{} for _ in range(n + 1)]
+
+        agenda: List[Item] = []
+        for p in por_izquierda.get(self.simbolo_inicial, []):
+            item = (p, 0, 0)
+            conjuntos[0].add(item)
+            agenda.append(item)
+
+        for j in range(n + 1):
+            actual = conjuntos[j]
+            siguiente = conjuntos[j + 1] if j < n else None
+            simbolo = cadena[j] if j < n else None
+            espera = esperando[j]
+            predichos: Set[str] = set()
+            pos = 0
+            while pos < len(agenda):
+                item = agenda[pos]
+                pos += 1
+                p, k, i = item
+                rhs = derechas[p]
+                if k < len(rhs):
+                    X = rhs[k]
+                    if X in no_terminales:
+                        espera.setdefault(X, []).append(item)
+                        if X not in predichos:
+                            predichos.add(X)
+                            for q in por_izquierda.get(X, []):
+                                nuevo = (q, 0, j)
+                                if nuevo not in actual:
+                                    actual.add(nuevo)
+                                    agenda.append(nuevo)
+                        if X in anulables:
+                            nuevo = (p, k + 1, i)
+                            if nuevo not in actual:
+                                actual.add(nuevo)
+                                agenda.append(nuevo)
+                    elif X == simbolo:
+                        siguiente.add((p, k + 1, i))
+                else:
+                    A = izquierdas[p]
+                    if (A, i) in completos[j]:
+                        continue
+                    completos[j].add((A, i))
+                    for p2, k2, i2 in esperando[i].get(A, []):
+                        nuevo = (p2, k2 + 1, i2)
+                        if nuevo not in actual:
+                            actual.add(nuevo)
+                            agenda.append(nuevo)
+            if siguiente is not None:
+                if not siguiente:
+                    return conjuntos, completos, False
+                agenda = list(siguiente)
+        return conjuntos, completos, (self.simbolo_inicial, 0) in completos[n]
+
+    def reconocer(self, cadena: str) -> bool:
+        return self._tabla(cadena)[2]
+
+    def analizar(self, cadena: str) -> Optional[BosqueAnalisis]:
+        conjuntos, completos, aceptada = self._tabla(cadena)
+        if not aceptada:
+            return None
+        return BosqueAnalisis(self, cadena, conjuntos, completos)
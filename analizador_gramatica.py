@@ -1,31 +1,75 @@
+import mmap
+import os
 import re
 from dataclasses import dataclass
-from typing import List
+from typing import IO, Iterator, List, Optional, Union
 
 @dataclass
 class Produccion:
     izquierda: str
     derecha: str
 
+@dataclass
+class ErrorSintaxis:
+    linea: int
+    texto: str
+    mensaje: str
+
 LINEA_GRAMATICA_RE = re.compile(r'^\s*([A-Za-z][A-Za-z0-9_]*)\s*(?:->|→)\s*(.+)$')
 
+def _parsear_linea(linea: str) -> List[Produccion]:
+    linea = linea.strip()
+    if not linea or linea.startswith("#"):
+        return []
+    m = LINEA_GRAMATICA_RE.match(linea)
+    if not m:
+        raise ValueError(f"Linea de gramatica no valida: '{linea}'")
+    izquierda, rhs = m.groups()
+    izquierda = izquierda.strip()
+    rhs = rhs.strip()
+    producciones: List[Produccion] = []
+    for alt in rhs.split("|"):
+        alt = alt.strip()
+        if alt in ("ε", "epsilon", "EPS", "E"):
+            alt = ""
+        producciones.append(Produccion(izquierda=izquierda, derecha=alt))
+    return producciones
+
 def parsear_gramatica(texto: str) -> List[Produccion]:
     producciones: List[Produccion] = []
     for linea in texto.splitlines():
-        linea = linea.strip()
-        if not linea or linea.startswith("#"):
-            continue
-        m = LINEA_GRAMATICA_RE.match(linea)
-        if not m:
-            raise ValueError(f"Linea de gramatica no valida: '{linea}'")
-        izquierda, rhs = m.groups()
-        izquierda = izquierda.strip()
-        rhs = rhs.strip()
-        for alt in rhs.split("|"):
-            alt = alt.strip()
-            if alt in ("ε", "epsilon", "EPS", "E"):
-                alt = ""
-            producciones.append(Produccion(izquierda=izquierda, derecha=alt))
+        producciones.extend(_parsear_linea(linea))
     if not producciones:
         raise ValueError("No se encontraron producciones en el texto ingresado.")
     return producciones
+
+def _lineas_de(fuente: Union[str, os.PathLike, IO]) -> Iterator[str]:
+    if isinstance(fuente, (str, os.PathLike)):
+        with open(fuente, "rb") as f:
+            try:
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                mapa = None
+            if mapa is None:
+                for crudo in f:
+                    yield crudo.decode("utf-8")
+                return
+            with mapa:
+                for crudo in iter(mapa.readline, b""):
+                    yield crudo.decode("utf-8")
+        return
+    for linea in fuente:
+        if isinstance(linea, bytes):
+            linea = linea.decode("utf-8")
+        yield linea
+
+def iterar_gramatica(fuente: Union[str, os.PathLike, IO], errores: Optional[List[ErrorSintaxis]] = None) -> Iterator[Produccion]:
+    for num, linea in enumerate(_lineas_de(fuente), start=1):
+        try:
+            producciones = _parsear_linea(linea)
+        except ValueError as e:
+            if errores is None:
+                raise ValueError(f"Linea {num}: {e}") from None
+            errores.append(ErrorSintaxis(linea=num, texto=linea.strip(), mensaje=str(e)))
+            continue
+        yield from producciones
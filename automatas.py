@@ -1,7 +1,16 @@
-from dataclasses import dataclass
-from typing import List, Any
+from dataclasses import dataclass, asdict, field, fields
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
+import codecs
 import json
-from clasificador import ResultadoClasificacion, TYPE_LABELS
+import os
+import re
+import time
+from array import array
+from tipos import ResultadoClasificacion, TYPE_LABELS
+from conversor import compilar_afd, minimizar_afd
+
+SIMBOLOS_EPSILON = ("", "ε", "epsilon", "EPS")
+MAX_CACHE_SUBCONJUNTOS = 65536
 
 @dataclass
 class Automata:
@@ -11,6 +20,19 @@ class Automata:
     transiciones: List[Any]
     estado_inicial: str
     estados_finales: List[str]
+    alfabeto_pila: List[str] = field(default_factory=list)
+    simbolo_inicial_pila: str = "Z"
+    aceptacion: str = ""
+    alfabeto_cinta: List[str] = field(default_factory=list)
+    simbolo_blanco: str = "_"
+
+_CAMPOS_OPCIONALES = {
+    "alfabeto_pila": [],
+    "simbolo_inicial_pila": "Z",
+    "aceptacion": "",
+    "alfabeto_cinta": [],
+    "simbolo_blanco": "_",
+}
 
 def cargar_automata_desde_json(texto_json: str) -> Automata:
     data = json.loads(texto_json)
@@ -21,25 +43,603 @@ def cargar_automata_desde_json(texto_json: str) -> Automata:
         transiciones=data.get("transiciones", []),
         estado_inicial=data.get("estado_inicial", ""),
         estados_finales=data.get("estados_finales", []),
+        **{c: data.get(c, defecto) for c, defecto in _CAMPOS_OPCIONALES.items()},
     )
 
-def clasificar_automata(automata: Automata) -> ResultadoClasificacion:
+def automata_a_json(automata: Automata) -> str:
+    data = asdict(automata)
+    for c, defecto in _CAMPOS_OPCIONALES.items():
+        if data[c] == defecto:
+            del data[c]
+    return json.dumps(data, indent=2)
+
+def motivo_no_minimizable(automata: Union[Automata, Dict, "IndiceTransiciones"]):
+    indice = indice_automata(automata)
+    modelo = indice.modelo()
+    if modelo == "AFD":
+        return None
+    if modelo != "AFN":
+        return f"Las transiciones corresponden a un {modelo}, no a un automata finito."
+    if indice.con_epsilon:
+        return "El automata tiene transiciones epsilon."
+    o, simbolo = indice.no_deterministas[0]
+    return f"El par ({o}, {simbolo}) tiene varios destinos."
+
+def minimizar_automata(automata: Automata) -> Automata:
+    indice = indice_automata(automata)
+    motivo = motivo_no_minimizable(indice)
+    if motivo is not None:
+        raise ValueError("Solo se pueden minimizar automatas finitos deterministas (AFD). " + motivo)
+    data = minimizar_afd(
+        {
+            "alfabeto": indice.alfabeto,
+            "estado_inicial": indice.estado_inicial,
+            "estados_finales": indice.estados_finales,
+            "transiciones": indice.transiciones,
+        }
+    )
+    return Automata(
+        tipo=automata.tipo,
+        estados=data["estados"],
+        alfabeto=data["alfabeto"],
+        transiciones=data["transiciones"],
+        estado_inicial=data["estado_inicial"],
+        estados_finales=data["estados_finales"],
+        **{c: getattr(automata, c) for c in _CAMPOS_OPCIONALES},
+    )
+
+FAMILIAS_DECLARADAS = {
+    "afd": "AFD", "dfa": "AFD",
+    "afn": "AFN", "nfa": "AFN", "afnd": "AFN", "afne": "AFN", "afnl": "AFN",
+    "ap": "AP", "pda": "AP",
+    "mt": "MT", "tm": "MT", "turing": "MT",
+    "ala": "ALA", "lba": "ALA",
+}
+
+def _como_dict(automata: Union[Automata, Dict]) -> Dict:
+    if isinstance(automata, dict):
+        return automata
+    return {f.name: getattr(automata, f.name) for f in fields(automata)}
+
+def _familia_declarada(tipo: str):
+    for palabra in re.findall(r"[a-z]+", (tipo or "").lower()):
+        if palabra in FAMILIAS_DECLARADAS:
+            return FAMILIAS_DECLARADAS[palabra]
+    return None
+
+class IndiceTransiciones:
+    def __init__(self, automata: Union[Automata, Dict]):
+        data = _como_dict(automata)
+        self.datos = data
+        self.tipo = data.get("tipo", "")
+        self.alfabeto = list(data.get("alfabeto", []))
+        alfabeto = set(self.alfabeto)
+        self.estados_declarados = list(data.get("estados", []))
+        self.estado_inicial = data.get("estado_inicial")
+        self.estados_finales = list(data.get("estados_finales", []))
+        self.transiciones: List[Dict] = [t if isinstance(t, dict) else vars(t) for t in data.get("transiciones", [])]
+
+        self.estados = list(self.estados_declarados)
+        self.ids: Dict[Any, int] = {}
+        for e in self.estados:
+            self.ids.setdefault(e, len(self.ids))
+        self.origen: List[Any] = []
+        self.simbolo: List[Any] = []
+        self.destino: List[Any] = []
+        self.por_origen: Dict[Any, List[int]] = {}
+        self.por_simbolo: Dict[Any, List[int]] = {}
+        self.por_destino: Dict[Any, List[int]] = {}
+        self.por_origen_simbolo: Dict[Tuple[Any, Any], List[int]] = {}
+        self.con_pila = False
+        self.con_cinta = False
+        no_declarados = []
+        fuera_alfabeto = []
+        for i, t in enumerate(self.transiciones):
+            o = t.get("origen")
+            d = t.get("destino")
+            simbolo = t.get("simbolo", "")
+            if simbolo in SIMBOLOS_EPSILON and simbolo not in alfabeto:
+                simbolo = None
+            elif alfabeto and simbolo not in alfabeto and simbolo not in fuera_alfabeto:
+                fuera_alfabeto.append(simbolo)
+            for e in (o, d):
+                if e not in self.ids:
+                    self.ids[e] = len(self.ids)
+                    self.estados.append(e)
+                    no_declarados.append(e)
+            self.origen.append(o)
+            self.simbolo.append(simbolo)
+            self.destino.append(d)
+            self.por_origen.setdefault(o, []).append(i)
+            self.por_simbolo.setdefault(simbolo, []).append(i)
+            self.por_destino.setdefault(d, []).append(i)
+            self.por_origen_simbolo.setdefault((o, simbolo), []).append(i)
+            if "desapila" in t or "apila" in t:
+                self.con_pila = True
+            if "escribe" in t or "mueve" in t:
+                self.con_cinta = True
+        if self.estado_inicial not in self.ids:
+            self.ids[self.estado_inicial] = len(self.ids)
+            self.estados.append(self.estado_inicial)
+
+        self.con_epsilon = None in self.por_simbolo
+        self.no_deterministas = [
+            clave
+            for clave, indices in self.por_origen_simbolo.items()
+            if clave[1] is not None and len({self.destino[i] for i in indices}) > 1
+        ]
+
+        self.problemas: List[str] = []
+        declarados = set(self.estados_declarados)
+        if self.estado_inicial not in declarados:
+            self.problemas.append(f"El estado inicial '{self.estado_inicial}' no esta en 'estados'.")
+        finales_ajenos = [f for f in self.estados_finales if f not in declarados]
+        if finales_ajenos:
+            self.problemas.append("Estados finales que no estan en 'estados': " + ", ".join(map(str, finales_ajenos)) + ".")
+        if no_declarados:
+            self.problemas.append("Estados usados en transiciones pero no declarados: " + ", ".join(map(str, no_declarados)) + ".")
+        if fuera_alfabeto and not self.con_cinta:
+            self.problemas.append("Simbolos usados en transiciones que no estan en 'alfabeto': " + ", ".join(map(str, fuera_alfabeto)) + ".")
+
+    @property
+    def determinista(self) -> bool:
+        return not self.con_epsilon and not self.no_deterministas
+
+    def modelo(self) -> str:
+        if self.con_cinta:
+            return "MT"
+        if self.con_pila:
+            return "AP"
+        return "AFD" if self.determinista else "AFN"
+
+def indice_automata(automata: Union[Automata, Dict, IndiceTransiciones]) -> IndiceTransiciones:
+    if isinstance(automata, IndiceTransiciones):
+        return automata
+    return IndiceTransiciones(automata)
+
+def clasificar_automata(automata: Union[Automata, Dict, IndiceTransiciones]) -> ResultadoClasificacion:
+    indice = indice_automata(automata)
     explicacion: List[str] = []
-    tipo_lower = automata.tipo.lower()
-    if "afd" in tipo_lower or "dfa" in tipo_lower or "afn" in tipo_lower or "nfa" in tipo_lower:
-        t = 3
-        explicacion.append("El automata se identifica como AFD o AFN.")
-        explicacion.append("Los automatas finitos reconocen lenguajes regulares (Tipo 3).")
-    elif "ap" in tipo_lower or "pda" in tipo_lower:
-        t = 2
-        explicacion.append("El automata se identifica como automata con pila (AP).")
-        explicacion.append("Los automatas con pila reconocen lenguajes libres de contexto (Tipo 2).")
-    elif "mt" in tipo_lower or "turing" in tipo_lower:
+    modelo = indice.modelo()
+    declarada = _familia_declarada(indice.tipo)
+    if modelo == "MT" and declarada == "ALA":
+        t = 1
+        modelo = "ALA"
+        explicacion.append("Las transiciones escriben en la cinta y se declaro como automata linealmente acotado (ALA).")
+        explicacion.append("Los automatas linealmente acotados reconocen lenguajes sensibles al contexto (Tipo 1).")
+    elif modelo == "MT":
         t = 0
-        explicacion.append("La maquina se identifica como Maquina de Turing.")
+        explicacion.append("Las transiciones escriben en la cinta y mueven el cabezal: es una Maquina de Turing.")
         explicacion.append("Las Maquinas de Turing reconocen lenguajes recursivamente enumerables (Tipo 0).")
+    elif modelo == "AP":
+        t = 2
+        explicacion.append("Las transiciones apilan o desapilan simbolos: es un automata con pila (AP).")
+        explicacion.append("Los automatas con pila reconocen lenguajes libres de contexto (Tipo 2).")
     else:
-        t = 0
-        explicacion.append("No se reconoce el tipo de automata de forma especifica.")
-        explicacion.append("Por defecto se toma como un modelo al nivel de Maquina de Turing (Tipo 0).")
+        t = 3
+        if modelo == "AFD":
+            explicacion.append("Cada par (estado, simbolo) tiene a lo sumo un destino y no hay transiciones epsilon: es un AFD.")
+        else:
+            motivos = []
+            if indice.con_epsilon:
+                motivos.append("tiene transiciones epsilon")
+            if indice.no_deterministas:
+                o, simbolo = indice.no_deterministas[0]
+                motivos.append(f"el par ({o}, {simbolo}) tiene varios destinos")
+            explicacion.append("El automata es no determinista (AFN): " + " y ".join(motivos) + ".")
+        if declarada in ("AP", "MT", "ALA"):
+            explicacion.append(f"Se declaro como {declarada}, pero ninguna transicion usa la pila ni la cinta, asi que se comporta como un automata finito.")
+        explicacion.append("Los automatas finitos reconocen lenguajes regulares (Tipo 3).")
+    if declarada is None:
+        if indice.tipo:
+            explicacion.append(f"El tipo declarado '{indice.tipo}' no se reconoce; se uso la estructura de las transiciones.")
+    elif declarada != modelo and not (declarada in ("AP", "MT", "ALA") and modelo in ("AFD", "AFN")):
+        explicacion.append(f"El tipo declarado '{indice.tipo}' no coincide con la estructura detectada ({modelo}).")
+    for problema in indice.problemas:
+        explicacion.append("Advertencia: " + problema)
     return ResultadoClasificacion(tipo=t, etiqueta=TYPE_LABELS[t], explicacion=explicacion)
+
+class SimuladorAF:
+    def __init__(self, automata: Union[Automata, Dict, IndiceTransiciones]):
+        indice = indice_automata(automata)
+        data = indice.datos
+        estados = indice.estados
+        inicial = indice.estado_inicial
+        self.estados = estados
+        self.ids = indice.ids
+
+        self.indice: Dict[Tuple[int, str], Tuple[int, ...]] = {}
+        epsilon: Dict[int, List[int]] = {}
+        for (origen, simbolo), posiciones in indice.por_origen_simbolo.items():
+            o = self.ids[origen]
+            destinos: List[int] = []
+            for i in posiciones:
+                d = self.ids[indice.destino[i]]
+                if d not in destinos:
+                    destinos.append(d)
+            if simbolo is None:
+                epsilon[o] = destinos
+            else:
+                self.indice[(o, simbolo)] = tuple(destinos)
+        self.con_epsilon = indice.con_epsilon
+        self.determinista = indice.determinista
+
+        self._cierres = [self._cierre_de(i, epsilon) for i in range(len(estados))]
+        self._finales = 0
+        for f in data.get("estados_finales", []):
+            if f in self.ids:
+                self._finales |= 1 << self.ids[f]
+        self.inicio = self._cierres[self.ids[inicial]]
+        self._pasos: Dict[Tuple[int, str], int] = {}
+
+        self._afd = None
+        if self.determinista:
+            self._afd = compilar_afd({
+                "estados": estados,
+                "alfabeto": data.get("alfabeto", []),
+                "estado_inicial": inicial,
+                "estados_finales": data.get("estados_finales", []),
+                "transiciones": [
+                    {"origen": estados[o], "simbolo": simbolo, "destino": estados[d[0]]}
+                    for (o, simbolo), d in self.indice.items()
+                ],
+            })
+
+        self.cadenas = 0
+        self.simbolos = 0
+        self.aceptadas = 0
+        self.segundos = 0.0
+
+    @staticmethod
+    def _cierre_de(estado: int, epsilon: Dict[int, List[int]]) -> int:
+        mascara = 1 << estado
+        pila = [estado]
+        while pila:
+            e = pila.pop()
+            for d in epsilon.get(e, ()):
+                if not mascara >> d & 1:
+                    mascara |= 1 << d
+                    pila.append(d)
+        return mascara
+
+    def _paso(self, actual: int, simbolo: str) -> int:
+        clave = (actual, simbolo)
+        siguiente = self._pasos.get(clave)
+        if siguiente is None:
+            siguiente = 0
+            resto = actual
+            while resto:
+                bajo = resto & -resto
+                for d in self.indice.get((bajo.bit_length() - 1, simbolo), ()):
+                    siguiente |= self._cierres[d]
+                resto ^= bajo
+            if len(self._pasos) >= MAX_CACHE_SUBCONJUNTOS:
+                self._pasos.clear()
+            self._pasos[clave] = siguiente
+        return siguiente
+
+    def estado_inicial(self):
+        return self._afd.inicio if self._afd is not None else self.inicio
+
+    def avanzar(self, estado, simbolos: Iterable[str]):
+        if self._afd is not None:
+            return self._afd.avanzar(estado, simbolos)
+        paso = self._paso
+        for simbolo in simbolos:
+            if not estado:
+                break
+            estado = paso(estado, simbolo)
+        return estado
+
+    def es_final(self, estado) -> bool:
+        if self._afd is not None:
+            return self._afd.es_final(estado)
+        return bool(estado & self._finales)
+
+    def _contar(self, longitud: int, aceptada: bool, inicio: float) -> bool:
+        self.cadenas += 1
+        self.simbolos += longitud
+        self.aceptadas += aceptada
+        self.segundos += time.perf_counter() - inicio
+        return aceptada
+
+    def acepta(self, cadena: Sequence[str]) -> bool:
+        inicio = time.perf_counter()
+        aceptada = self.es_final(self.avanzar(self.estado_inicial(), cadena))
+        return self._contar(len(cadena), aceptada, inicio)
+
+    def acepta_varios(self, cadenas: Iterable[Sequence[str]]) -> List[bool]:
+        return [self.acepta(c) for c in cadenas]
+
+    def acepta_flujo(self, flujo, tam_bloque: int = 1 << 16) -> bool:
+        inicio = time.perf_counter()
+        estado = self.estado_inicial()
+        longitud = 0
+        if hasattr(flujo, "read"):
+            bloques = iter(lambda: flujo.read(tam_bloque), flujo.read(0))
+        else:
+            bloques = flujo
+        decodificador = codecs.getincrementaldecoder("utf-8")()
+        for bloque in bloques:
+            if isinstance(bloque, bytes):
+                bloque = decodificador.decode(bloque)
+            estado = self.avanzar(estado, bloque)
+            longitud += len(bloque)
+        resto = decodificador.decode(b"", final=True)
+        if resto:
+            estado = self.avanzar(estado, resto)
+            longitud += len(resto)
+        return self._contar(longitud, self.es_final(estado), inicio)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        return {
+            "cadenas": self.cadenas,
+            "simbolos": self.simbolos,
+            "aceptadas": self.aceptadas,
+            "segundos": self.segundos,
+            "simbolos_por_segundo": self.simbolos / self.segundos if self.segundos else 0.0,
+            "determinista": self.determinista,
+            "subconjuntos_en_cache": len(self._pasos),
+        }
+
+def simular_automata(automata: Union[Automata, Dict]) -> SimuladorAF:
+    return SimuladorAF(automata)
+
+ACEPTACION_ESTADO_FINAL = "estado_final"
+ACEPTACION_PILA_VACIA = "pila_vacia"
+MAX_CONFIGURACIONES = 1_000_000
+
+@dataclass
+class ResultadoEjecucion:
+    aceptada: bool
+    motivo: str
+    pasos: int
+    cinta: str = ""
+
+class SimuladorAP:
+    def __init__(self, automata: Union[Automata, Dict, IndiceTransiciones], aceptacion: str = None, max_configuraciones: int = MAX_CONFIGURACIONES):
+        indice = indice_automata(automata)
+        data = indice.datos
+        alfabeto_pila = set(data.get("alfabeto_pila", []))
+        self.aceptacion = aceptacion or data.get("aceptacion") or ACEPTACION_ESTADO_FINAL
+        if self.aceptacion not in (ACEPTACION_ESTADO_FINAL, ACEPTACION_PILA_VACIA):
+            raise ValueError(f"Modo de aceptacion no valido: '{self.aceptacion}'")
+        self.max_configuraciones = max_configuraciones
+        self.inicial = data.get("estado_inicial")
+        self.finales = set(data.get("estados_finales", []))
+        self.fondo = self._simbolos_pila(data.get("simbolo_inicial_pila", "Z"), alfabeto_pila)
+        self.max_apilados = 1
+
+        self.indice: Dict[Tuple[Any, Any, Any], List[Tuple[Any, Tuple[str, ...]]]] = {}
+        for t, simbolo in zip(indice.transiciones, indice.simbolo):
+            desapila = t.get("desapila", "")
+            if desapila in SIMBOLOS_EPSILON and desapila not in alfabeto_pila:
+                desapila = None
+            apila = self._simbolos_pila(t.get("apila", ""), alfabeto_pila)
+            self.max_apilados = max(self.max_apilados, len(apila))
+            clave = (t.get("origen"), simbolo, desapila)
+            self.indice.setdefault(clave, []).append((t.get("destino"), apila))
+
+    @staticmethod
+    def _simbolos_pila(valor, alfabeto_pila) -> Tuple[str, ...]:
+        if isinstance(valor, (list, tuple)):
+            return tuple(v for v in valor if not (v in SIMBOLOS_EPSILON and v not in alfabeto_pila))
+        if valor in SIMBOLOS_EPSILON and valor not in alfabeto_pila:
+            return ()
+        return tuple(valor)
+
+    def ejecutar(self, cadena: Sequence[str], max_pila: int = None) -> ResultadoEjecucion:
+        if max_pila is None:
+            max_pila = len(self.fondo) + self.max_apilados * (len(cadena) + 1) + len(self.indice)
+        nodos: Dict[Tuple[str, int], int] = {}
+        cima: List[Any] = [None]
+        debajo: List[int] = [0]
+        altura: List[int] = [0]
+
+        def apilar(pila: int, simbolos: Tuple[str, ...]) -> int:
+            for simbolo in reversed(simbolos):
+                clave = (simbolo, pila)
+                nodo = nodos.get(clave)
+                if nodo is None:
+                    nodo = len(cima)
+                    nodos[clave] = nodo
+                    cima.append(simbolo)
+                    debajo.append(pila)
+                    altura.append(altura[pila] + 1)
+                pila = nodo
+            return pila
+
+        indice = self.indice
+        vacio = ()
+        pasos = 0
+        actuales = {(self.inicial, apilar(0, self.fondo))}
+        for pos in range(len(cadena) + 1):
+            agenda = list(actuales)
+            while agenda:
+                estado, pila = agenda.pop()
+                tope = cima[pila]
+                for desapila in (None, tope) if pila else (None,):
+                    base = debajo[pila] if desapila is not None else pila
+                    for destino, apila in indice.get((estado, None, desapila), vacio):
+                        nueva = apilar(base, apila)
+                        if altura[nueva] > max_pila:
+                            continue
+                        config = (destino, nueva)
+                        if config not in actuales:
+                            actuales.add(config)
+                            agenda.append(config)
+                            pasos += 1
+                if pasos > self.max_configuraciones:
+                    return ResultadoEjecucion(False, "limite", pasos)
+
+            if pos == len(cadena):
+                break
+            simbolo = cadena[pos]
+            siguientes = set()
+            for estado, pila in actuales:
+                tope = cima[pila]
+                for desapila in (None, tope) if pila else (None,):
+                    base = debajo[pila] if desapila is not None else pila
+                    for destino, apila in indice.get((estado, simbolo, desapila), vacio):
+                        nueva = apilar(base, apila)
+                        if altura[nueva] <= max_pila:
+                            siguientes.add((destino, nueva))
+            pasos += len(siguientes)
+            if not siguientes:
+                return ResultadoEjecucion(False, "rechazada", pasos)
+            if pasos > self.max_configuraciones:
+                return ResultadoEjecucion(False, "limite", pasos)
+            actuales = siguientes
+
+        if self.aceptacion == ACEPTACION_PILA_VACIA:
+            aceptada = any(pila == 0 for _, pila in actuales)
+        else:
+            aceptada = any(estado in self.finales for estado, _ in actuales)
+        return ResultadoEjecucion(aceptada, "aceptada" if aceptada else "rechazada", pasos)
+
+    def acepta(self, cadena: Sequence[str]) -> bool:
+        return self.ejecutar(cadena).aceptada
+
+    def acepta_varios(self, cadenas: Iterable[Sequence[str]]) -> List[bool]:
+        return [self.acepta(c) for c in cadenas]
+
+MAX_PASOS_MT = 1_000_000
+MOVIMIENTOS_MT = {"L": -1, "I": -1, "S": 0, "N": 0, "R": 1, "D": 1}
+
+class SimuladorMT:
+    def __init__(self, automata: Union[Automata, Dict, IndiceTransiciones], max_pasos: int = MAX_PASOS_MT, max_segundos: float = None, detectar_bucles: bool = True):
+        indice = indice_automata(automata)
+        data = indice.datos
+        self.max_pasos = max_pasos
+        self.max_segundos = max_segundos
+        self.detectar_bucles = detectar_bucles
+        self.blanco = data.get("simbolo_blanco") or "_"
+        self.simbolos: List[str] = [self.blanco]
+        self.ids_simbolo: Dict[str, int] = {self.blanco: 0}
+        for simbolo in list(data.get("alfabeto_cinta", [])) + list(data.get("alfabeto", [])):
+            self._id_simbolo(simbolo)
+
+        estados = indice.estados
+        self.estados = estados
+        self.ids_estado = indice.ids
+        self.inicial = self.ids_estado[indice.estado_inicial]
+        self.finales = bytearray(len(estados))
+        for f in data.get("estados_finales", []):
+            if f in self.ids_estado:
+                self.finales[self.ids_estado[f]] = 1
+
+        transiciones = []
+        for t in indice.transiciones:
+            leido = self._id_simbolo(t.get("simbolo", self.blanco) or self.blanco)
+            escrito = self._id_simbolo(t.get("escribe", t.get("simbolo", self.blanco)) or self.blanco)
+            mueve = str(t.get("mueve") or "R").upper()
+            if mueve not in MOVIMIENTOS_MT:
+                raise ValueError(f"Movimiento de cinta no valido: '{t.get('mueve')}'")
+            transiciones.append((self.ids_estado[t.get("origen")], leido, self.ids_estado[t.get("destino")], escrito, MOVIMIENTOS_MT[mueve] + 1))
+        self.id_desconocido = len(self.simbolos)
+        if self.id_desconocido >= 256:
+            raise ValueError("La cinta admite como maximo 255 simbolos distintos.")
+        self.simbolos.append("?")
+
+        self.ancho = 256
+        self.tabla = array("i", [-1]) * (len(estados) * self.ancho)
+        for origen, leido, destino, escrito, mueve in transiciones:
+            pos = origen * self.ancho + leido
+            valor = (destino << 10) | (escrito << 2) | mueve
+            if self.tabla[pos] not in (-1, valor):
+                raise ValueError(
+                    f"La maquina no es determinista en ({self.estados[origen]}, {self.simbolos[leido]})."
+                )
+            self.tabla[pos] = valor
+
+    def _id_simbolo(self, simbolo: str) -> int:
+        i = self.ids_simbolo.get(simbolo)
+        if i is None:
+            i = len(self.simbolos)
+            if i >= 256:
+                raise ValueError("La cinta admite como maximo 256 simbolos distintos.")
+            self.ids_simbolo[simbolo] = i
+            self.simbolos.append(simbolo)
+        return i
+
+    def _cinta_texto(self, cinta: bytearray) -> str:
+        return "".join(self.simbolos[c] for c in cinta).strip(self.blanco)
+
+    def ejecutar(self, cadena: Sequence[str], max_pasos: int = None, max_segundos: float = None) -> ResultadoEjecucion:
+        max_pasos = self.max_pasos if max_pasos is None else max_pasos
+        max_segundos = self.max_segundos if max_segundos is None else max_segundos
+        limite_tiempo = time.perf_counter() + max_segundos if max_segundos is not None else None
+        ids = self.ids_simbolo
+        desconocido = self.id_desconocido
+        cinta = bytearray(ids.get(c, desconocido) for c in cadena) or bytearray(1)
+        tabla = self.tabla
+        ancho = self.ancho
+        finales = self.finales
+        estado = self.inicial
+        cabeza = 0
+        origen = 0
+        pasos = 0
+        guardado = None
+        siguiente_control = 1
+
+        while True:
+            if finales[estado]:
+                return ResultadoEjecucion(True, "aceptada", pasos, self._cinta_texto(cinta))
+            accion = tabla[estado * ancho + cinta[cabeza]]
+            if accion < 0:
+                return ResultadoEjecucion(False, "rechazada", pasos, self._cinta_texto(cinta))
+            if pasos >= max_pasos:
+                return ResultadoEjecucion(False, "limite_pasos", pasos, self._cinta_texto(cinta))
+            cinta[cabeza] = (accion >> 2) & 0xFF
+            estado = accion >> 10
+            cabeza += (accion & 3) - 1
+            pasos += 1
+            if cabeza < 0:
+                extension = len(cinta)
+                cinta[0:0] = bytes(extension)
+                cabeza += extension
+                origen += extension
+            elif cabeza == len(cinta):
+                cinta.extend(bytes(len(cinta)))
+
+            if pasos & 0xFFF == 0 and limite_tiempo is not None and time.perf_counter() > limite_tiempo:
+                return ResultadoEjecucion(False, "limite_tiempo", pasos, self._cinta_texto(cinta))
+            if self.detectar_bucles:
+                if guardado is not None and estado == guardado[0] and cabeza - origen == guardado[1]:
+                    if len(cinta) == guardado[3] and hash(bytes(cinta)) == guardado[2] and origen == guardado[4]:
+                        return ResultadoEjecucion(False, "bucle", pasos, self._cinta_texto(cinta))
+                if pasos == siguiente_control:
+                    guardado = (estado, cabeza - origen, hash(bytes(cinta)), len(cinta), origen)
+                    siguiente_control *= 2
+
+    def acepta(self, cadena: Sequence[str]) -> bool:
+        return self.ejecutar(cadena).aceptada
+
+_SIMULADOR_MT = None
+
+def _iniciar_proceso_mt(data: Dict, max_pasos: int, max_segundos: float) -> None:
+    global _SIMULADOR_MT
+    _SIMULADOR_MT = SimuladorMT(data, max_pasos=max_pasos, max_segundos=max_segundos)
+
+def _ejecutar_en_proceso(cadena: str) -> ResultadoEjecucion:
+    return _SIMULADOR_MT.ejecutar(cadena)
+
+def ejecutar_mt_lote(
+    automata: Union[Automata, Dict],
+    cadenas: Iterable[str],
+    procesos: int = 0,
+    max_pasos: int = MAX_PASOS_MT,
+    max_segundos: float = 1.0,
+    tam_bloque: int = 16,
+) -> Iterable[ResultadoEjecucion]:
+    data = _como_dict(automata)
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        simulador = SimuladorMT(data, max_pasos=max_pasos, max_segundos=max_segundos)
+        for cadena in cadenas:
+            yield simulador.ejecutar(cadena)
+        return
+    import multiprocessing
+
+    with multiprocessing.Pool(procesos, initializer=_iniciar_proceso_mt, initargs=(data, max_pasos, max_segundos)) as pool:
+        yield from pool.imap(_ejecutar_en_proceso, cadenas, chunksize=tam_bloque)
@@ -0,0 +1,80 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+MODULOS_NUCLEO = [
+    "tipos",
+    "instrumentacion",
+    "analizador_gramatica",
+    "gramatica_compilada",
+    "conversor",
+    "clasificador",
+    "automatas",
+    "analizador_earley",
+    "cache_clasificacion",
+    "ejemplos",
+    "tutor",
+    "lote",
+]
+MODULOS_PESADOS = ["visualizador", "reportes", "main"]
+PROHIBIDOS_EN_NUCLEO = ("tkinter", "graphviz", "reportlab", "numpy")
+
+_SONDA = """
+import json, sys, time
+t = time.perf_counter()
+try:
+    import {modulo}
+    error = None
+except Exception as e:
+    error = repr(e)
+ms = (time.perf_counter() - t) * 1000
+pesados = [m for m in {prohibidos!r} if m in sys.modules]
+print(json.dumps({{"ms": ms, "error": error, "pesados": pesados}}))
+"""
+
+
+def medir_importacion(modulo: str, repeticiones: int = 3) -> Dict:
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    mejores: List[float] = []
+    ultimo: Dict = {}
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, "-c", _SONDA.format(modulo=modulo, prohibidos=PROHIBIDOS_EN_NUCLEO)],
+            cwd=directorio,
+            capture_output=True,
+            text=True,
+        )
+        ultimo = json.loads(salida.stdout.strip().splitlines()[-1])
+        mejores.append(ultimo["ms"])
+    return {"modulo": modulo, "ms": min(mejores), "error": ultimo["error"], "pesados": ultimo["pesados"]}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mide el tiempo de importacion en frio de cada modulo.")
+    parser.add_argument("--presupuesto-ms", type=float, default=50.0, help="Tiempo maximo permitido por modulo del nucleo.")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    fallos: List[str] = []
+    resultados = []
+    for modulo in MODULOS_NUCLEO + MODULOS_PESADOS:
+        r = medir_importacion(modulo, args.repeticiones)
+        r["nucleo"] = modulo in MODULOS_NUCLEO
+        resultados.append(r)
+        if r["nucleo"]:
+            if r["error"]:
+                fallos.append(f"{modulo}: error al importar ({r['error']})")
+            elif r["ms"] > args.presupuesto_ms:
+                fallos.append(f"{modulo}: {r['ms']:.1f} ms supera el presupuesto de {args.presupuesto_ms:.1f} ms")
+            if r["pesados"]:
+                fallos.append(f"{modulo}: importa dependencias pesadas {r['pesados']}")
+
+    print(json.dumps({"presupuesto_ms": args.presupuesto_ms, "modulos": resultados, "fallos": fallos}, indent=2))
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
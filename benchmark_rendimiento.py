@@ -0,0 +1,280 @@
+import argparse
+import json
+import math
+import os
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from analizador_gramatica import parsear_gramatica
+from clasificador import clasificar_gramatica_texto, comparar_gramaticas_texto, generar_cadenas
+from conversor import _a_postfijo, _insertar_concat, _nfa_a_dfa, _nfa_desde_postfijo, minimizar_afd, regex_a_afd
+
+TAMANOS = {
+    "gramatica": [25, 50, 100, 200, 400],
+    "altura": [1, 2, 3, 4, 5],
+    "ancho": [4, 8, 16, 32, 52],
+    "estados": [50, 100, 200, 400, 800],
+}
+TAMANOS_RAPIDOS = {
+    "gramatica": [10, 20, 40],
+    "altura": [1, 2, 3],
+    "ancho": [4, 8, 16],
+    "estados": [20, 40, 80],
+}
+LETRAS = string.ascii_lowercase + string.ascii_uppercase
+
+
+def _no_terminal(i: int) -> str:
+    return "S" if i == 0 else f"N{i}"
+
+
+def gramatica_sintetica(producciones: int, tipo: int) -> str:
+    niveles = max(1, producciones // 2)
+    lineas: List[str] = []
+    for i in range(niveles):
+        actual = _no_terminal(i)
+        siguiente = _no_terminal(i + 1) if i + 1 < niveles else None
+        if tipo == 3:
+            lineas.append(f"{actual} -> a{siguiente} | b" if siguiente else f"{actual} -> a | b")
+        elif tipo == 2:
+            lineas.append(f"{actual} -> a{siguiente}b | {siguiente}c" if siguiente else f"{actual} -> ab | c")
+        elif tipo == 1:
+            if siguiente:
+                lineas.append(f"{actual} -> aB{siguiente} | b")
+                lineas.append(f"B{siguiente} -> b{siguiente}")
+            else:
+                lineas.append(f"{actual} -> a | b")
+        else:
+            if siguiente:
+                lineas.append(f"{actual} -> aB{siguiente} | b")
+                lineas.append(f"B{siguiente} -> b")
+            else:
+                lineas.append(f"{actual} -> a | epsilon")
+    if tipo in (0, 1):
+        lineas.append("B -> b")
+    return "\n".join(lineas)
+
+
+def regex_sintetica(altura: int = 1, ancho: int = 2) -> str:
+    regex = "(" + "|".join(LETRAS[i % len(LETRAS)] for i in range(max(1, ancho))) + ")"
+    for nivel in range(altura):
+        regex = "(" + regex + LETRAS[nivel % len(LETRAS)] + ")*"
+    return regex
+
+
+def afd_sintetico(estados: int) -> Dict:
+    nombres = [f"q{i}" for i in range(estados)]
+    transiciones = []
+    for i, q in enumerate(nombres):
+        transiciones.append({"origen": q, "simbolo": "a", "destino": nombres[(i + 1) % estados]})
+        transiciones.append({"origen": q, "simbolo": "b", "destino": nombres[(2 * i + 1) % estados]})
+    return {
+        "tipo": "AFD",
+        "estados": nombres,
+        "alfabeto": ["a", "b"],
+        "estado_inicial": nombres[0],
+        "estados_finales": [q for i, q in enumerate(nombres) if i % 3 == 0],
+        "transiciones": transiciones,
+    }
+
+
+def _nfa_de(regex: str):
+    return _nfa_desde_postfijo(_a_postfijo(_insertar_concat(regex)))
+
+
+def _preparar_dibujo(n: int) -> Callable[[], None]:
+    import visualizador
+
+    automata = afd_sintetico(n)
+    directorio = tempfile.mkdtemp()
+
+    def correr() -> None:
+        visualizador.CACHE_DIAGRAMAS = visualizador.CacheDiagramas()
+        visualizador.dibujar_automata(automata, os.path.join(directorio, "afd"))
+
+    return correr
+
+
+def _preparar_reporte(n: int) -> Callable[[], None]:
+    from reportes import generar_reporte_pdf
+
+    texto = gramatica_sintetica(n, 2)
+    resultado = clasificar_gramatica_texto(texto)
+    ruta = os.path.join(tempfile.mkdtemp(), "reporte.pdf")
+    return lambda: generar_reporte_pdf(ruta, "Benchmark", texto, True, resultado, [])
+
+
+def _preparar_comparacion(n: int) -> Callable[[], None]:
+    texto1 = gramatica_sintetica(n, 2)
+    texto2 = gramatica_sintetica(n, 2).replace("c", "a")
+    return lambda: comparar_gramaticas_texto(texto1, texto2, max_longitud=6)
+
+
+ETAPAS: List[Tuple[str, str, Callable[[int], Callable[[], object]]]] = [
+    ("parsear_gramatica", "gramatica", lambda n: (lambda t=gramatica_sintetica(n, 2): parsear_gramatica(t))),
+    ("clasificar_tipo3", "gramatica", lambda n: (lambda t=gramatica_sintetica(n, 3): clasificar_gramatica_texto(t))),
+    ("clasificar_tipo2", "gramatica", lambda n: (lambda t=gramatica_sintetica(n, 2): clasificar_gramatica_texto(t))),
+    ("clasificar_tipo1", "gramatica", lambda n: (lambda t=gramatica_sintetica(n, 1): clasificar_gramatica_texto(t))),
+    ("clasificar_tipo0", "gramatica", lambda n: (lambda t=gramatica_sintetica(n, 0): clasificar_gramatica_texto(t))),
+    ("generar_cadenas", "gramatica", lambda n: (lambda p=parsear_gramatica(gramatica_sintetica(n, 2)): generar_cadenas(p, max_longitud=6))),
+    ("comparar_gramaticas", "gramatica", _preparar_comparacion),
+    ("regex_a_afd_altura", "altura", lambda n: (lambda r=regex_sintetica(altura=n, ancho=4): regex_a_afd(r))),
+    ("regex_a_afd_ancho", "ancho", lambda n: (lambda r=regex_sintetica(altura=2, ancho=n): regex_a_afd(r))),
+    ("nfa_a_dfa", "ancho", lambda n: (lambda nfa=_nfa_de(regex_sintetica(altura=2, ancho=n)): _nfa_a_dfa(nfa))),
+    ("minimizar_afd", "estados", lambda n: (lambda a=afd_sintetico(n): minimizar_afd(a))),
+    ("dibujar_automata", "estados", _preparar_dibujo),
+    ("generar_reporte_pdf", "gramatica", _preparar_reporte),
+]
+ETAPAS_RENDER = {"dibujar_automata", "generar_reporte_pdf"}
+
+
+def _motivo_sin_render(etapa: str) -> Optional[str]:
+    try:
+        if etapa == "dibujar_automata":
+            import visualizador
+
+            visualizador.renderizar(visualizador.grafo_automata(afd_sintetico(2)))
+        else:
+            import reportes
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def medir(funcion: Callable[[], object], repeticiones: int) -> Dict:
+    tiempos: List[float] = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tracemalloc.start()
+    try:
+        funcion()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"ms": min(tiempos), "ms_mediana": sorted(tiempos)[len(tiempos) // 2], "pico_kb": pico / 1024}
+
+
+def exponente_escalado(puntos: List[Dict]) -> Optional[float]:
+    pares = [(math.log(p["n"]), math.log(p["ms"])) for p in puntos if p["n"] > 0 and p["ms"] > 0]
+    if len(pares) < 2:
+        return None
+    mx = sum(x for x, _ in pares) / len(pares)
+    my = sum(y for _, y in pares) / len(pares)
+    den = sum((x - mx) ** 2 for x, _ in pares)
+    if den == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in pares) / den
+
+
+def ejecutar_suite(
+    etapas: Optional[List[str]] = None,
+    tamanos: Optional[Dict[str, List[int]]] = None,
+    repeticiones: int = 3,
+    con_render: bool = True,
+) -> Dict:
+    tamanos = tamanos or TAMANOS
+    resultados = []
+    for nombre, dimension, preparar in ETAPAS:
+        if etapas and nombre not in etapas:
+            continue
+        entrada: Dict = {"etapa": nombre, "dimension": dimension, "puntos": []}
+        if nombre in ETAPAS_RENDER:
+            motivo = "desactivado con --sin-render" if not con_render else _motivo_sin_render(nombre)
+            if motivo:
+                entrada["omitida"] = motivo
+                resultados.append(entrada)
+                continue
+        for n in tamanos[dimension]:
+            punto = {"n": n}
+            try:
+                punto.update(medir(preparar(n), repeticiones))
+            except Exception as e:
+                punto["error"] = f"{type(e).__name__}: {e}"
+            entrada["puntos"].append(punto)
+        entrada["exponente"] = exponente_escalado([p for p in entrada["puntos"] if "ms" in p])
+        resultados.append(entrada)
+    return {
+        "python": sys.version.split()[0],
+        "repeticiones": repeticiones,
+        "etapas": resultados,
+    }
+
+
+def comparar_con_base(actual: Dict, base: Dict, tolerancia: float = 0.25, min_ms: float = 1.0) -> List[str]:
+    previos = {
+        (e["etapa"], p["n"]): p
+        for e in base.get("etapas", [])
+        for p in e.get("puntos", [])
+        if "ms" in p
+    }
+    regresiones: List[str] = []
+    for e in actual["etapas"]:
+        for p in e.get("puntos", []):
+            anterior = previos.get((e["etapa"], p["n"]))
+            if anterior is None:
+                continue
+            if "ms" not in p:
+                regresiones.append(f"{e['etapa']} n={p['n']}: fallo ({p.get('error')})")
+                continue
+            limite = anterior["ms"] * (1 + tolerancia)
+            if p["ms"] > limite and p["ms"] - anterior["ms"] >= min_ms:
+                regresiones.append(
+                    f"{e['etapa']} n={p['n']}: {p['ms']:.2f} ms frente a {anterior['ms']:.2f} ms de la base "
+                    f"(+{(p['ms'] / anterior['ms'] - 1) * 100:.0f}%)"
+                )
+            pico_anterior = anterior.get("pico_kb")
+            if pico_anterior and p["pico_kb"] > pico_anterior * (1 + tolerancia) and p["pico_kb"] - pico_anterior >= 64:
+                regresiones.append(
+                    f"{e['etapa']} n={p['n']}: memoria pico {p['pico_kb']:.0f} KB frente a {pico_anterior:.0f} KB de la base"
+                )
+    return regresiones
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mide el rendimiento de cada etapa con cargas sinteticas crecientes.")
+    parser.add_argument("--etapas", nargs="*", help="Etapas a medir (por defecto, todas).")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--rapido", action="store_true", help="Usar tamanos pequenos.")
+    parser.add_argument("--sin-render", action="store_true", help="Omitir las etapas que usan Graphviz o ReportLab.")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados (por defecto, stdout).")
+    parser.add_argument("--base", help="Archivo JSON de una ejecucion anterior contra el que buscar regresiones.")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Aumento relativo permitido frente a la base.")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="Aumento absoluto minimo para contar como regresion.")
+    args = parser.parse_args(argv)
+
+    nombres = [nombre for nombre, _, _ in ETAPAS]
+    desconocidas = [e for e in args.etapas or [] if e not in nombres]
+    if desconocidas:
+        parser.error(f"etapas desconocidas: {desconocidas}; disponibles: {nombres}")
+
+    resultado = ejecutar_suite(
+        etapas=args.etapas,
+        tamanos=TAMANOS_RAPIDOS if args.rapido else TAMANOS,
+        repeticiones=args.repeticiones,
+        con_render=not args.sin_render,
+    )
+    if args.base:
+        with open(args.base, encoding="utf-8") as f:
+            resultado["regresiones"] = comparar_con_base(resultado, json.load(f), args.tolerancia, args.min_ms)
+
+    texto = json.dumps(resultado, indent=2)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+    if resultado.get("regresiones"):
+        for r in resultado["regresiones"]:
+            print("REGRESION " + r, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import collections
+import hashlib
+import json
+import threading
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Optional
+
+from analizador_gramatica import parsear_gramatica
+from automatas import Automata, clasificar_automata
+from clasificador import clasificar_gramatica_texto, comparar_gramaticas_texto
+from tipos import ExplicacionPerezosa, ResultadoClasificacion, ResultadoPerezoso
+
+
+def forma_normal_gramatica(texto: str) -> str:
+    producciones = parsear_gramatica(texto)
+    reglas = sorted({p.izquierda + "->" + p.derecha for p in producciones})
+    return producciones[0].izquierda + "\n" + "\n".join(reglas)
+
+
+def forma_normal_automata(automata: Automata) -> str:
+    data = asdict(automata)
+    for campo in ("estados", "alfabeto", "estados_finales"):
+        data[campo] = sorted(str(x) for x in data[campo])
+    data["transiciones"] = sorted(json.dumps(t, sort_keys=True) for t in data["transiciones"])
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+def _hash(*partes: str) -> str:
+    h = hashlib.sha256()
+    for p in partes:
+        h.update(p.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class CacheClasificacion:
+    def __init__(self, max_entradas: int = 1024, ruta_disco: Optional[str] = None):
+        self.max_entradas = max_entradas
+        self.ruta_disco = ruta_disco
+        self._memoria: "collections.OrderedDict[str, Any]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._conexion = None
+        self.aciertos_memoria = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        self.desalojos = 0
+        if ruta_disco:
+            import sqlite3
+
+            self._conexion = sqlite3.connect(ruta_disco, timeout=30, check_same_thread=False)
+            self._conexion.execute("CREATE TABLE IF NOT EXISTS resultados (clave TEXT PRIMARY KEY, valor TEXT)")
+            self._conexion.commit()
+
+    def _guardar_memoria(self, clave: str, valor: Any) -> None:
+        self._memoria[clave] = valor
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.max_entradas:
+            self._memoria.popitem(last=False)
+            self.desalojos += 1
+
+    def obtener(self, clave: str, contar_fallo: bool = True) -> Optional[Any]:
+        with self._lock:
+            if clave in self._memoria:
+                self._memoria.move_to_end(clave)
+                self.aciertos_memoria += 1
+                return self._memoria[clave]
+            if self._conexion is not None:
+                fila = self._conexion.execute("SELECT valor FROM resultados WHERE clave = ?", (clave,)).fetchone()
+                if fila is not None:
+                    valor = json.loads(fila[0])
+                    self._guardar_memoria(clave, valor)
+                    self.aciertos_disco += 1
+                    return valor
+            if contar_fallo:
+                self.fallos += 1
+            return None
+
+    def guardar(self, clave: str, valor: Any) -> None:
+        with self._lock:
+            self._guardar_memoria(clave, valor)
+            if self._conexion is not None:
+                self._conexion.execute(
+                    "INSERT OR REPLACE INTO resultados (clave, valor) VALUES (?, ?)",
+                    (clave, json.dumps(valor, default=_a_json)),
+                )
+                self._conexion.commit()
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._memoria.clear()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        return {
+            "entradas_memoria": len(self._memoria),
+            "max_entradas": self.max_entradas,
+            "aciertos_memoria": self.aciertos_memoria,
+            "aciertos_disco": self.aciertos_disco,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+            "disco": self.ruta_disco,
+        }
+
+    def cerrar(self) -> None:
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+
+
+CACHE = CacheClasificacion()
+
+
+def configurar_cache(max_entradas: int = 1024, ruta_disco: Optional[str] = None) -> CacheClasificacion:
+    global CACHE
+    CACHE.cerrar()
+    CACHE = CacheClasificacion(max_entradas=max_entradas, ruta_disco=ruta_disco)
+    return CACHE
+
+
+def _a_json(o: Any) -> Any:
+    if isinstance(o, ExplicacionPerezosa):
+        return o()
+    return list(o)
+
+
+def _resultado_a_dict(r: ResultadoClasificacion) -> Dict[str, Any]:
+    explicacion = r.perezosa if isinstance(r, ResultadoPerezoso) else list(r.explicacion)
+    return {"tipo": r.tipo, "etiqueta": r.etiqueta, "explicacion": explicacion}
+
+
+def _dict_a_resultado(d: Dict[str, Any]) -> ResultadoClasificacion:
+    explicacion = d["explicacion"]
+    if not isinstance(explicacion, ExplicacionPerezosa):
+        lineas = list(explicacion)
+        explicacion = ExplicacionPerezosa(lambda: lineas)
+    return ResultadoPerezoso(tipo=d["tipo"], etiqueta=d["etiqueta"], explicacion=explicacion)
+
+
+def _con_cache(clave_cruda: str, normalizar: Callable[[], str], calcular: Callable[[], Any]) -> Any:
+    valor = CACHE.obtener(clave_cruda, contar_fallo=False)
+    if valor is not None:
+        return valor
+    clave = normalizar()
+    valor = CACHE.obtener(clave)
+    if valor is None:
+        valor = calcular()
+        CACHE.guardar(clave, valor)
+    if clave != clave_cruda:
+        CACHE.guardar(clave_cruda, valor)
+    return valor
+
+
+def clasificar_gramatica_cacheada(texto: str) -> ResultadoClasificacion:
+    valor = _con_cache(
+        _hash("gramatica-texto", texto),
+        lambda: _hash("gramatica", forma_normal_gramatica(texto)),
+        lambda: _resultado_a_dict(clasificar_gramatica_texto(texto)),
+    )
+    return _dict_a_resultado(valor)
+
+
+def clasificar_automata_cacheada(automata: Automata) -> ResultadoClasificacion:
+    clave = _hash("automata-estructural", forma_normal_automata(automata))
+    valor = _con_cache(
+        clave,
+        lambda: clave,
+        lambda: _resultado_a_dict(clasificar_automata(automata)),
+    )
+    return _dict_a_resultado(valor)
+
+
+def comparar_gramaticas_cacheada(
+    texto1: str,
+    texto2: str,
+    max_longitud: int = 4,
+    modo: str = "tablas",
+    al_progresar: Optional[Callable[[int], None]] = None,
+) -> str:
+    return _con_cache(
+        _hash("comparacion-texto-v2", texto1, texto2, str(max_longitud), modo),
+        lambda: _hash(
+            "comparacion-v2",
+            forma_normal_gramatica(texto1),
+            forma_normal_gramatica(texto2),
+            str(max_longitud),
+            modo,
+        ),
+        lambda: comparar_gramaticas_texto(
+            texto1, texto2, max_longitud=max_longitud, modo=modo, al_progresar=al_progresar
+        ),
+    )
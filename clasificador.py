@@ -1,155 +1,487 @@
-from dataclasses import dataclass
-from typing import List, Tuple, Set
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Set, Union
 import collections
-from analizador_gramatica import Produccion, parsear_gramatica
+import instrumentacion
+from analizador_gramatica import ErrorSintaxis, Produccion, _parsear_linea, iterar_gramatica, parsear_gramatica
+from conversor import afd_acepta, afd_equivalentes, gramatica_regular_a_afd
+from gramatica_compilada import GramaticaCompilada, ProduccionCompilada, compilar_gramatica, es_no_terminal
+from tipos import TYPE_LABELS, ExplicacionPerezosa, ResultadoClasificacion, ResultadoPerezoso
 
-TYPE_LABELS = {
-    0: "Tipo 0 - Lenguaje Recursivamente Enumerable",
-    1: "Tipo 1 - Lenguaje Sensible al Contexto",
-    2: "Tipo 2 - Lenguaje Libre de Contexto",
-    3: "Tipo 3 - Lenguaje Regular",
-}
+REGULAR_LADO_IZQUIERDO = "regular_lado_izquierdo"
+REGULAR_UNITARIA = "regular_unitaria"
+REGULAR_FORMA_AB = "regular_forma_aB"
+REGULAR_LARGA = "regular_larga"
+LIBRE_LADO_IZQUIERDO = "libre_lado_izquierdo"
+SENSIBLE_EPSILON = "sensible_epsilon"
+SENSIBLE_CONTRAE = "sensible_contrae"
 
-@dataclass
-class ResultadoClasificacion:
-    tipo: int
-    etiqueta: str
-    explicacion: List[str]
+Violacion = Tuple[int, str]
+Progreso = Optional[Callable[[int], None]]
 
-def es_no_terminal(s: str) -> bool:
-    return len(s) == 1 and s.isupper()
+class AnalisisGramatica:
+    __slots__ = ("producciones", "violacion_regular", "violacion_libre", "violacion_sensible")
 
-def revisar_regular(producciones: List[Produccion]) -> Tuple[bool, List[str]]:
+    def __init__(self, producciones: List[Produccion], violacion_regular: Optional[Violacion], violacion_libre: Optional[Violacion], violacion_sensible: Optional[Violacion]):
+        self.producciones = producciones
+        self.violacion_regular = violacion_regular
+        self.violacion_libre = violacion_libre
+        self.violacion_sensible = violacion_sensible
+
+    @property
+    def tipo(self) -> int:
+        if self.violacion_regular is None:
+            return 3
+        if self.violacion_libre is None:
+            return 2
+        if self.violacion_sensible is None and self.producciones:
+            return 1
+        return 0
+
+def _codigos_produccion(p: ProduccionCompilada, no_terminal: bytearray, simbolo_inicial: Tuple[int, ...]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    L = p.izquierda
+    R = p.derecha
+    lado_izquierdo_ok = len(L) == 1 and no_terminal[L[0]]
+    reg: Optional[str] = None
+    glc: Optional[str] = None
+    sens: Optional[str] = None
+    if not lado_izquierdo_ok:
+        glc = LIBRE_LADO_IZQUIERDO
+        reg = REGULAR_LADO_IZQUIERDO
+    elif len(R) == 1:
+        if no_terminal[R[0]]:
+            reg = REGULAR_UNITARIA
+    elif len(R) == 2:
+        if no_terminal[R[0]] or not no_terminal[R[1]]:
+            reg = REGULAR_FORMA_AB
+    elif len(R) > 2:
+        reg = REGULAR_LARGA
+    if not R:
+        if L != simbolo_inicial:
+            sens = SENSIBLE_EPSILON
+    elif len(L) > len(R):
+        sens = SENSIBLE_CONTRAE
+    return reg, glc, sens
+
+class AnalizadorIncremental:
+    def __init__(self):
+        self.gramatica = GramaticaCompilada([])
+        self.violacion_regular: Optional[Violacion] = None
+        self.violacion_libre: Optional[Violacion] = None
+        self.violacion_sensible: Optional[Violacion] = None
+
+    def agregar(self, produccion: Produccion) -> None:
+        g = self.gramatica
+        p = g.agregar(produccion)
+        if self.violacion_regular is not None and self.violacion_libre is not None and self.violacion_sensible is not None:
+            return
+        reg, glc, sens = _codigos_produccion(p, g.no_terminal, g.inicial)
+        if self.violacion_regular is None and reg is not None:
+            self.violacion_regular = (p.indice, reg)
+        if self.violacion_libre is None and glc is not None:
+            self.violacion_libre = (p.indice, glc)
+        if self.violacion_sensible is None and sens is not None:
+            self.violacion_sensible = (p.indice, sens)
+
+    def resultado(self) -> AnalisisGramatica:
+        if self.gramatica.tokenizacion_cambiada:
+            return analizar_gramatica(self.gramatica.originales)
+        return AnalisisGramatica(self.gramatica.originales, self.violacion_regular, self.violacion_libre, self.violacion_sensible)
+
+@instrumentacion.medido("clasificador.analizar_gramatica")
+def analizar_gramatica(producciones: Union[List[Produccion], GramaticaCompilada]) -> AnalisisGramatica:
+    gramatica = compilar_gramatica(producciones)
+    no_terminal = gramatica.no_terminal
+    simbolo_inicial = gramatica.inicial
+    v_reg: Optional[Violacion] = None
+    v_glc: Optional[Violacion] = None
+    v_sens: Optional[Violacion] = None
+    for i, p in enumerate(gramatica.producciones):
+        reg, glc, sens = _codigos_produccion(p, no_terminal, simbolo_inicial)
+        if v_reg is None and reg is not None:
+            v_reg = (i, reg)
+        if v_glc is None and glc is not None:
+            v_glc = (i, glc)
+        if v_sens is None and sens is not None:
+            v_sens = (i, sens)
+        if v_reg is not None and v_glc is not None and v_sens is not None:
+            break
+    return AnalisisGramatica(gramatica.originales, v_reg, v_glc, v_sens)
+
+def _explicar_regular(analisis: AnalisisGramatica) -> List[str]:
     razones: List[str] = []
     razones.append("Revisando si la gramatica puede ser Tipo 3 (Regular).")
-    for p in producciones:
+    violacion = analisis.violacion_regular
+    ultima = violacion[0] if violacion else len(analisis.producciones)
+    for p in analisis.producciones[:ultima]:
         L = p.izquierda
         R = p.derecha
-        if len(L) != 1 or not es_no_terminal(L):
-            razones.append(f"- La produccion '{L} -> {R or 'epsilon'}' no tiene un solo no terminal en el lado izquierdo.")
-            razones.append("Conclusion: la gramatica no es Tipo 3.")
-            return False, razones
         if R == "":
             razones.append(f"- La produccion '{L} -> epsilon' se acepta como caso especial.")
-            continue
-        if len(R) == 1:
-            a = R[0]
-            if es_no_terminal(a):
-                razones.append(f"- La produccion '{L} -> {R}' usa solo no terminales en el lado derecho, no es de la forma A -> a.")
-                razones.append("Conclusion: la gramatica no es Tipo 3.")
-                return False, razones
+        elif len(R) == 1:
             razones.append(f"- La produccion '{L} -> {R}' es de la forma A -> a.")
-            continue
-        if len(R) == 2:
-            a, B = R[0], R[1]
-            if es_no_terminal(a) or not es_no_terminal(B):
-                razones.append(f"- La produccion '{L} -> {R}' no es de la forma A -> aB.")
-                razones.append("Conclusion: la gramatica no es Tipo 3.")
-                return False, razones
+        else:
             razones.append(f"- La produccion '{L} -> {R}' es de la forma A -> aB.")
-            continue
+    if violacion is None:
+        razones.append("Todas las producciones cumplen las formas permitidas para una gramatica regular.")
+        return razones
+    indice, codigo = violacion
+    L = analisis.producciones[indice].izquierda
+    R = analisis.producciones[indice].derecha
+    if codigo == REGULAR_LADO_IZQUIERDO:
+        razones.append(f"- La produccion '{L} -> {R or 'epsilon'}' no tiene un solo no terminal en el lado izquierdo.")
+    elif codigo == REGULAR_UNITARIA:
+        razones.append(f"- La produccion '{L} -> {R}' usa solo no terminales en el lado derecho, no es de la forma A -> a.")
+    elif codigo == REGULAR_FORMA_AB:
+        razones.append(f"- La produccion '{L} -> {R}' no es de la forma A -> aB.")
+    else:
         razones.append(f"- La produccion '{L} -> {R}' tiene longitud mayor que 2 en el lado derecho.")
-        razones.append("Conclusion: la gramatica no es Tipo 3.")
-        return False, razones
-    razones.append("Todas las producciones cumplen las formas permitidas para una gramatica regular.")
-    return True, razones
+    razones.append("Conclusion: la gramatica no es Tipo 3.")
+    return razones
 
-def revisar_libre_contexto(producciones: List[Produccion]) -> Tuple[bool, List[str]]:
+def _explicar_libre_contexto(analisis: AnalisisGramatica) -> List[str]:
     razones: List[str] = []
     razones.append("Revisando si la gramatica puede ser Tipo 2 (Libre de contexto).")
-    for p in producciones:
-        L = p.izquierda
-        R = p.derecha
-        if len(L) != 1 or not es_no_terminal(L):
-            razones.append(f"- La produccion '{L} -> {R or 'epsilon'}' no tiene exactamente un no terminal en el lado izquierdo.")
-            razones.append("Conclusion: la gramatica no es Tipo 2.")
-            return False, razones
-    razones.append("Todas las producciones tienen un solo no terminal en el lado izquierdo.")
-    return True, razones
+    violacion = analisis.violacion_libre
+    if violacion is None:
+        razones.append("Todas las producciones tienen un solo no terminal en el lado izquierdo.")
+        return razones
+    p = analisis.producciones[violacion[0]]
+    razones.append(f"- La produccion '{p.izquierda} -> {p.derecha or 'epsilon'}' no tiene exactamente un no terminal en el lado izquierdo.")
+    razones.append("Conclusion: la gramatica no es Tipo 2.")
+    return razones
 
-def revisar_sensible_contexto(producciones: List[Produccion]) -> Tuple[bool, List[str]]:
+def _explicar_sensible_contexto(analisis: AnalisisGramatica) -> List[str]:
     razones: List[str] = []
     razones.append("Revisando si la gramatica puede ser Tipo 1 (Sensible al contexto).")
-    if not producciones:
+    if not analisis.producciones:
         razones.append("No hay producciones.")
-        return False, razones
-    simbolo_inicial = producciones[0].izquierda
-    for p in producciones:
-        L = p.izquierda
-        R = p.derecha
-        if R == "" and L != simbolo_inicial:
-            razones.append(f"- La produccion '{L} -> epsilon' esta permitida solo para el simbolo inicial '{simbolo_inicial}'.")
-            razones.append("Conclusion: la gramatica no es Tipo 1.")
-            return False, razones
-        if len(L) > len(R) and R != "":
-            razones.append(f"- La produccion '{L} -> {R}' viola la condicion |LHS| <= |RHS|.")
-            razones.append("Conclusion: la gramatica no es Tipo 1.")
-            return False, razones
-    razones.append("Todas las producciones respetan la condicion de longitud para Tipo 1.")
-    return True, razones
+        return razones
+    violacion = analisis.violacion_sensible
+    if violacion is None:
+        razones.append("Todas las producciones respetan la condicion de longitud para Tipo 1.")
+        return razones
+    indice, codigo = violacion
+    p = analisis.producciones[indice]
+    if codigo == SENSIBLE_EPSILON:
+        simbolo_inicial = analisis.producciones[0].izquierda
+        razones.append(f"- La produccion '{p.izquierda} -> epsilon' esta permitida solo para el simbolo inicial '{simbolo_inicial}'.")
+    else:
+        razones.append(f"- La produccion '{p.izquierda} -> {p.derecha}' viola la condicion |LHS| <= |RHS|.")
+    razones.append("Conclusion: la gramatica no es Tipo 1.")
+    return razones
 
-def clasificar_gramatica_texto(texto: str) -> ResultadoClasificacion:
-    producciones = parsear_gramatica(texto)
-    explicacion_total: List[str] = []
-    es_reg, exp_reg = revisar_regular(producciones)
-    explicacion_total.extend(exp_reg)
-    if es_reg:
-        tipo = 3
+@instrumentacion.medido("clasificador.revisar_regular")
+def revisar_regular(producciones: List[Produccion]) -> Tuple[bool, List[str]]:
+    analisis = analizar_gramatica(producciones)
+    return analisis.violacion_regular is None, _explicar_regular(analisis)
+
+@instrumentacion.medido("clasificador.revisar_libre_contexto")
+def revisar_libre_contexto(producciones: List[Produccion]) -> Tuple[bool, List[str]]:
+    analisis = analizar_gramatica(producciones)
+    return analisis.violacion_libre is None, _explicar_libre_contexto(analisis)
+
+@instrumentacion.medido("clasificador.revisar_sensible_contexto")
+def revisar_sensible_contexto(producciones: List[Produccion]) -> Tuple[bool, List[str]]:
+    analisis = analizar_gramatica(producciones)
+    es_sens = analisis.violacion_sensible is None and bool(producciones)
+    return es_sens, _explicar_sensible_contexto(analisis)
+
+def explicar_analisis(analisis: AnalisisGramatica) -> List[str]:
+    tipo = analisis.tipo
+    explicacion_total = _explicar_regular(analisis)
+    if tipo == 3:
         explicacion_total.append("La gramatica cumple las condiciones de Tipo 3 (Regular).")
-        return ResultadoClasificacion(tipo=tipo, etiqueta=TYPE_LABELS[tipo], explicacion=explicacion_total)
-    es_glc, exp_glc = revisar_libre_contexto(producciones)
-    explicacion_total.extend(exp_glc)
-    if es_glc:
-        tipo = 2
+        return explicacion_total
+    explicacion_total.extend(_explicar_libre_contexto(analisis))
+    if tipo == 2:
         explicacion_total.append("La gramatica cumple las condiciones de Tipo 2 (Libre de contexto).")
-        return ResultadoClasificacion(tipo=tipo, etiqueta=TYPE_LABELS[tipo], explicacion=explicacion_total)
-    es_sens, exp_sens = revisar_sensible_contexto(producciones)
-    explicacion_total.extend(exp_sens)
-    if es_sens:
-        tipo = 1
+        return explicacion_total
+    explicacion_total.extend(_explicar_sensible_contexto(analisis))
+    if tipo == 1:
         explicacion_total.append("La gramatica cumple las condiciones de Tipo 1 (Sensible al contexto).")
-        return ResultadoClasificacion(tipo=tipo, etiqueta=TYPE_LABELS[tipo], explicacion=explicacion_total)
-    tipo = 0
+        return explicacion_total
     explicacion_total.append("La gramatica no cumple las condiciones de los tipos 3, 2 ni 1.")
     explicacion_total.append("Conclusion final: se clasifica como Tipo 0 (Lenguaje recursivamente enumerable).")
-    return ResultadoClasificacion(tipo=tipo, etiqueta=TYPE_LABELS[tipo], explicacion=explicacion_total)
+    return explicacion_total
+
+def clasificar_producciones(producciones: List[Produccion]) -> ResultadoClasificacion:
+    analisis = analizar_gramatica(producciones)
+    tipo = analisis.tipo
+    return ResultadoPerezoso(
+        tipo=tipo,
+        etiqueta=TYPE_LABELS[tipo],
+        explicacion=ExplicacionPerezosa(lambda: explicar_analisis(analisis)),
+    )
+
+def clasificar_gramatica_texto(texto: str) -> ResultadoClasificacion:
+    return clasificar_producciones(parsear_gramatica(texto))
+
+def clasificar_gramatica_archivo(fuente) -> Tuple[ResultadoClasificacion, List[ErrorSintaxis]]:
+    errores: List[ErrorSintaxis] = []
+    analizador = AnalizadorIncremental()
+    for p in iterar_gramatica(fuente, errores):
+        analizador.agregar(p)
+    if not analizador.gramatica.producciones:
+        raise ValueError("No se encontraron producciones en el texto ingresado.")
+    analisis = analizador.resultado()
+    tipo = analisis.tipo
+    resultado = ResultadoPerezoso(
+        tipo=tipo,
+        etiqueta=TYPE_LABELS[tipo],
+        explicacion=ExplicacionPerezosa(lambda: explicar_analisis(analisis)),
+    )
+    return resultado, errores
+
+VeredictoProduccion = Tuple[Produccion, Optional[str], Optional[str], Optional[str]]
+
+class ClasificadorPorLineas:
+    def __init__(self):
+        self._lineas: Dict[str, Union[List[Produccion], str]] = {}
+        self._veredictos: Dict[str, List[VeredictoProduccion]] = {}
+        self._multi: frozenset = frozenset()
+        self._gramatica = GramaticaCompilada([])
+        self.lineas_recalculadas = 0
+
+    def _parsear(self, linea: str) -> Union[List[Produccion], str]:
+        parseada = self._lineas.get(linea)
+        if parseada is None:
+            try:
+                parseada = _parsear_linea(linea)
+            except ValueError as e:
+                parseada = str(e)
+            self._lineas[linea] = parseada
+        return parseada
+
+    def _veredicto(self, linea: str, producciones: List[Produccion]) -> List[VeredictoProduccion]:
+        veredicto = self._veredictos.get(linea)
+        if veredicto is None:
+            self.lineas_recalculadas += 1
+            veredicto = []
+            g = self._gramatica
+            for produccion in producciones:
+                p = g.agregar(produccion)
+                reg, glc, sens = _codigos_produccion(p, g.no_terminal, p.izquierda)
+                veredicto.append((produccion, reg, glc, sens))
+            self._veredictos[linea] = veredicto
+        return veredicto
 
-def generar_cadenas(producciones: List[Produccion], max_longitud: int = 4, simbolo_inicial: str = "S") -> Set[str]:
+    def analizar(self, texto: str) -> Tuple[Optional[AnalisisGramatica], List[ErrorSintaxis]]:
+        lineas = texto.splitlines()
+        errores: List[ErrorSintaxis] = []
+        parseadas: List[Tuple[str, List[Produccion]]] = []
+        multi = set()
+        for num, linea in enumerate(lineas, start=1):
+            parseada = self._parsear(linea)
+            if isinstance(parseada, str):
+                errores.append(ErrorSintaxis(linea=num, texto=linea.strip(), mensaje=parseada))
+                continue
+            if parseada:
+                parseadas.append((linea, parseada))
+                izquierda = parseada[0].izquierda
+                if len(izquierda) > 1 and es_no_terminal(izquierda):
+                    multi.add(izquierda)
+        if multi != self._multi:
+            cambiados = list(multi.symmetric_difference(self._multi))
+            self._multi = frozenset(multi)
+            self._gramatica = GramaticaCompilada([], multi=multi)
+            for linea in [k for k in self._veredictos if any(n in k for n in cambiados)]:
+                del self._veredictos[linea]
+        if len(self._lineas) > 2 * len(lineas) + 64:
+            vigentes = set(lineas)
+            self._lineas = {k: v for k, v in self._lineas.items() if k in vigentes}
+            self._veredictos = {k: v for k, v in self._veredictos.items() if k in vigentes}
+            self._gramatica = GramaticaCompilada([], multi=self._multi)
+        if not parseadas:
+            return None, errores
+
+        inicial = parseadas[0][1][0].izquierda
+        producciones: List[Produccion] = []
+        v_reg: Optional[Violacion] = None
+        v_glc: Optional[Violacion] = None
+        v_sens: Optional[Violacion] = None
+        for linea, parseada in parseadas:
+            for produccion, reg, glc, sens in self._veredicto(linea, parseada):
+                i = len(producciones)
+                producciones.append(produccion)
+                if sens is None and not produccion.derecha and produccion.izquierda != inicial:
+                    sens = SENSIBLE_EPSILON
+                if v_reg is None and reg is not None:
+                    v_reg = (i, reg)
+                if v_glc is None and glc is not None:
+                    v_glc = (i, glc)
+                if v_sens is None and sens is not None:
+                    v_sens = (i, sens)
+        return AnalisisGramatica(producciones, v_reg, v_glc, v_sens), errores
+
+def _generar_cadenas_bfs(producciones: Union[List[Produccion], GramaticaCompilada], max_longitud: int, simbolo_inicial: str, al_progresar: Progreso = None) -> Set[str]:
+    gramatica = compilar_gramatica(producciones)
+    no_terminal = gramatica.no_terminal
+    por_izquierda: Dict[int, List[Tuple[int, ...]]] = {
+        nt: [p.derecha for p in alternativas] for nt, alternativas in gramatica.por_izquierda.items()
+    }
+    inicial = gramatica.ids.get(simbolo_inicial)
+    if inicial is None:
+        return set()
     agenda = collections.deque()
-    visitados: Set[str] = set()
-    agenda.append(simbolo_inicial)
-    visitados.add(simbolo_inicial)
+    visitados: Set[Tuple[int, ...]] = set()
+    agenda.append((inicial,))
+    visitados.add((inicial,))
     resultados: Set[str] = set()
+    expandidas = 0
+    duplicados = 0
     while agenda:
-        cadena = agenda.popleft()
-        if all(not c.isupper() for c in cadena):
-            if len(cadena) <= max_longitud:
-                resultados.add(cadena)
-            continue
-        if len(cadena) > max_longitud + 2:
-            continue
+        forma = agenda.popleft()
+        expandidas += 1
+        if al_progresar is not None and expandidas % 1024 == 0:
+            al_progresar(len(resultados))
         idx = None
-        for i, c in enumerate(cadena):
-            if c.isupper():
+        for i, x in enumerate(forma):
+            if no_terminal[x]:
                 idx = i
                 break
         if idx is None:
+            if len(forma) <= max_longitud:
+                resultados.add(gramatica.texto(forma))
+            continue
+        if len(forma) > max_longitud + 2:
             continue
-        nt = cadena[idx]
-        for p in producciones:
-            if p.izquierda == nt:
-                reemplazo = p.derecha
-                nueva = cadena[:idx] + reemplazo + cadena[idx + 1 :]
-                if len(nueva) <= max_longitud + 2 and nueva not in visitados:
-                    visitados.add(nueva)
-                    agenda.append(nueva)
+        for reemplazo in por_izquierda.get(forma[idx], ()):
+            nueva = forma[:idx] + reemplazo + forma[idx + 1 :]
+            if len(nueva) > max_longitud + 2:
+                continue
+            if nueva in visitados:
+                duplicados += 1
+            else:
+                visitados.add(nueva)
+                agenda.append(nueva)
+    if instrumentacion.ACTIVA:
+        instrumentacion.contar("clasificador.generar_cadenas.formas_expandidas", expandidas)
+        instrumentacion.contar("clasificador.generar_cadenas.duplicados", duplicados)
     return resultados
 
-def comparar_gramaticas_texto(texto1: str, texto2: str, max_longitud: int = 4) -> str:
+def _combinar_por_longitud(derecha: Tuple[int, ...], n: int, tablas: Dict[int, List[Set[str]]], gramatica: GramaticaCompilada) -> Set[str]:
+    sufijos: Dict[Tuple[int, int], Set[str]] = {}
+    nombres = gramatica.nombres
+    no_terminal = gramatica.no_terminal
+
+    def sufijo(i: int, m: int) -> Set[str]:
+        if i == len(derecha):
+            return {""} if m == 0 else set()
+        clave = (i, m)
+        if clave in sufijos:
+            return sufijos[clave]
+        x = derecha[i]
+        res: Set[str] = set()
+        if not no_terminal[x]:
+            if m >= 1:
+                for resto in sufijo(i + 1, m - 1):
+                    res.add(nombres[x] + resto)
+        elif x in tablas:
+            niveles = tablas[x]
+            for l in range(m + 1):
+                cabezas = niveles[l]
+                if not cabezas:
+                    continue
+                colas = sufijo(i + 1, m - l)
+                for cabeza in cabezas:
+                    for cola in colas:
+                        res.add(cabeza + cola)
+        sufijos[clave] = res
+        return res
+
+    return sufijo(0, n)
+
+def _generar_cadenas_tablas(producciones: Union[List[Produccion], GramaticaCompilada], max_longitud: int, simbolo_inicial: str, al_progresar: Progreso = None) -> Set[str]:
+    gramatica = compilar_gramatica(producciones)
+    reglas = gramatica.por_izquierda
+    inicial = gramatica.ids.get(simbolo_inicial)
+    if inicial not in reglas:
+        return set()
+    tablas: Dict[int, List[Set[str]]] = {nt: [set() for _ in range(max_longitud + 1)] for nt in reglas}
+    generadas = 0
+    expandidas = 0
+    duplicados = 0
+    for n in range(max_longitud + 1):
+        cambio = True
+        while cambio:
+            cambio = False
+            for nt, alternativas in reglas.items():
+                nivel = tablas[nt][n]
+                for p in alternativas:
+                    nuevas = _combinar_por_longitud(p.derecha, n, tablas, gramatica)
+                    expandidas += 1
+                    if not nuevas <= nivel:
+                        antes = len(nivel)
+                        nivel |= nuevas
+                        generadas += len(nivel) - antes
+                        duplicados += len(nuevas) - (len(nivel) - antes)
+                        cambio = True
+                    else:
+                        duplicados += len(nuevas)
+                if al_progresar is not None:
+                    al_progresar(generadas)
+    if instrumentacion.ACTIVA:
+        instrumentacion.contar("clasificador.generar_cadenas.formas_expandidas", expandidas)
+        instrumentacion.contar("clasificador.generar_cadenas.duplicados", duplicados)
+    resultados: Set[str] = set()
+    for nivel in tablas[inicial]:
+        resultados |= nivel
+    return resultados
+
+@instrumentacion.medido("clasificador.generar_cadenas")
+def generar_cadenas(producciones: List[Produccion], max_longitud: int = 4, simbolo_inicial: Optional[str] = None, modo: str = "tablas", al_progresar: Progreso = None) -> Set[str]:
+    if simbolo_inicial is None:
+        simbolo_inicial = _simbolo_inicial(producciones)
+    if modo == "bfs":
+        return _generar_cadenas_bfs(producciones, max_longitud, simbolo_inicial, al_progresar)
+    if modo == "tablas":
+        return _generar_cadenas_tablas(producciones, max_longitud, simbolo_inicial, al_progresar)
+    raise ValueError(f"Modo de generacion no valido: '{modo}'")
+
+def _simbolo_inicial(producciones: Union[List[Produccion], GramaticaCompilada]) -> str:
+    if isinstance(producciones, GramaticaCompilada):
+        return producciones.texto(producciones.inicial)
+    return producciones[0].izquierda if producciones else "S"
+
+def _comparar_regulares(p1: List[Produccion], p2: List[Produccion], inicial1: str, inicial2: str) -> str:
+    afd1 = gramatica_regular_a_afd(p1, simbolo_inicial=inicial1)
+    afd2 = gramatica_regular_a_afd(p2, simbolo_inicial=inicial2)
+    equivalentes, cadena = afd_equivalentes(afd1, afd2)
+    if equivalentes:
+        return "Equivalencia exacta: ambas gramaticas son regulares y generan el mismo lenguaje."
+    origen = "la primera" if afd_acepta(afd1, cadena) else "la segunda"
+    partes: List[str] = []
+    partes.append("Las gramaticas son regulares y NO generan el mismo lenguaje (resultado exacto).")
+    partes.append(f"Cadena distintiva mas corta: '{cadena or 'epsilon'}', generada solo por {origen} gramatica.")
+    return "\n".join(partes)
+
+def comparar_gramaticas_texto(
+    texto1: str,
+    texto2: str,
+    max_longitud: int = 4,
+    modo: str = "tablas",
+    al_progresar: Progreso = None,
+    simbolo_inicial1: Optional[str] = None,
+    simbolo_inicial2: Optional[str] = None,
+) -> str:
     p1 = parsear_gramatica(texto1)
     p2 = parsear_gramatica(texto2)
-    lang1 = generar_cadenas(p1, max_longitud=max_longitud)
-    lang2 = generar_cadenas(p2, max_longitud=max_longitud)
+    inicial1 = simbolo_inicial1 or _simbolo_inicial(p1)
+    inicial2 = simbolo_inicial2 or _simbolo_inicial(p2)
+    sin_reglas = [
+        f"{cual} gramatica no tiene producciones para su simbolo inicial '{inicial}'."
+        for cual, p, inicial in (("La primera", p1, inicial1), ("La segunda", p2, inicial2))
+        if not any(x.izquierda == inicial for x in p)
+    ]
+    if sin_reglas:
+        return "No se puede comparar:\n" + "\n".join(sin_reglas)
+    if analizar_gramatica(p1).violacion_regular is None and analizar_gramatica(p2).violacion_regular is None:
+        return _comparar_regulares(p1, p2, inicial1, inicial2)
+    lang1 = generar_cadenas(p1, max_longitud=max_longitud, simbolo_inicial=inicial1, modo=modo, al_progresar=al_progresar)
+    progreso2 = None
+    if al_progresar is not None:
+        progreso2 = lambda n: al_progresar(len(lang1) + n)
+    lang2 = generar_cadenas(p2, max_longitud=max_longitud, simbolo_inicial=inicial2, modo=modo, al_progresar=progreso2)
     if lang1 == lang2:
         return "Posible equivalencia: los lenguajes generados coinciden hasta la longitud maxima indicada."
     solo1 = sorted(list(lang1 - lang2))
@@ -161,3 +493,179 @@ def comparar_gramaticas_texto(texto1: str, texto2: str, max_longitud: int = 4) -
     if solo2:
         partes.append("Cadenas generadas solo por la segunda gramatica: " + ", ".join(solo2))
     return "\n".join(partes)
+
+@dataclass(frozen=True)
+class ReglaFNC:
+    izquierda: str
+    derecha: Tuple[str, ...]
+    origen: int
+
+@dataclass
+class GramaticaFNC:
+    simbolo_inicial: str
+    reglas: List[ReglaFNC]
+    acepta_vacia: bool
+    no_terminales: List[str] = field(default_factory=list)
+
+def convertir_a_fnc(producciones: Union[List[Produccion], GramaticaCompilada], simbolo_inicial: Optional[str] = None) -> GramaticaFNC:
+    gramatica = compilar_gramatica(producciones)
+    analisis = analizar_gramatica(gramatica)
+    if analisis.violacion_libre is not None:
+        razones = _explicar_libre_contexto(analisis)
+        raise ValueError("Solo las gramaticas libres de contexto se pueden llevar a FNC:\n" + "\n".join(razones))
+
+    nombres = gramatica.nombres
+    if simbolo_inicial is None:
+        simbolo_inicial = gramatica.texto(gramatica.inicial)
+    variables: Set[str] = {n for n, nt in zip(nombres, gramatica.no_terminal) if nt}
+    variables.add(simbolo_inicial)
+
+    def nombre_nuevo(base: str) -> str:
+        nombre = base
+        k = 0
+        while nombre in gramatica.ids or nombre in variables:
+            k += 1
+            nombre = f"{base}_{k}"
+        variables.add(nombre)
+        return nombre
+
+    inicio = nombre_nuevo(simbolo_inicial + "0")
+    reglas: List[Tuple[str, Tuple[str, ...], int]] = [(inicio, (simbolo_inicial,), -1)]
+    terminales: Dict[str, str] = {}
+    for p in gramatica.producciones:
+        idx = p.indice
+        derecha = [nombres[x] for x in p.derecha]
+        if len(derecha) >= 2:
+            for pos, x in enumerate(p.derecha):
+                if not gramatica.no_terminal[x]:
+                    t = nombres[x]
+                    if t not in terminales:
+                        terminales[t] = nombre_nuevo("T_" + t)
+                    reglas.append((terminales[t], (t,), idx))
+                    derecha[pos] = terminales[t]
+        izquierda = nombres[p.izquierda[0]]
+        k = 1
+        while len(derecha) > 2:
+            auxiliar = nombre_nuevo(f"{nombres[p.izquierda[0]]}_{idx}_{k}")
+            reglas.append((izquierda, (derecha[0], auxiliar), idx))
+            izquierda = auxiliar
+            derecha = derecha[1:]
+            k += 1
+        reglas.append((izquierda, tuple(derecha), idx))
+
+    anulables: Set[str] = set()
+    cambio = True
+    while cambio:
+        cambio = False
+        for izq, der, _ in reglas:
+            if izq not in anulables and all(x in anulables for x in der):
+                anulables.add(izq)
+                cambio = True
+
+    sin_vacias: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+    for izq, der, origen in reglas:
+        variantes = [der]
+        if len(der) == 2:
+            if der[0] in anulables:
+                variantes.append((der[1],))
+            if der[1] in anulables:
+                variantes.append((der[0],))
+        for v in variantes:
+            if v:
+                sin_vacias.setdefault((izq, v), origen)
+
+    unitarias: Dict[str, Set[str]] = {}
+    no_unitarias: Dict[str, List[Tuple[Tuple[str, ...], int]]] = {}
+    for (izq, der), origen in sin_vacias.items():
+        if len(der) == 1 and der[0] in variables:
+            unitarias.setdefault(izq, set()).add(der[0])
+        else:
+            no_unitarias.setdefault(izq, []).append((der, origen))
+
+    finales: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+    no_terminales: List[str] = []
+    for a in [inicio] + sorted((set(unitarias) | set(no_unitarias)) - {inicio}):
+        alcanzables = {a}
+        pila = [a]
+        while pila:
+            b = pila.pop()
+            for c in unitarias.get(b, ()):
+                if c not in alcanzables:
+                    alcanzables.add(c)
+                    pila.append(c)
+        for b in alcanzables:
+            for der, origen in no_unitarias.get(b, []):
+                finales.setdefault((a, der), origen)
+        no_terminales.append(a)
+
+    return GramaticaFNC(
+        simbolo_inicial=inicio,
+        reglas=[ReglaFNC(izquierda=izq, derecha=der, origen=origen) for (izq, der), origen in finales.items()],
+        acepta_vacia=inicio in anulables,
+        no_terminales=no_terminales,
+    )
+
+class CYKCompilado:
+    def __init__(self, fnc: GramaticaFNC):
+        self.fnc = fnc
+        self.ids = {nt: i for i, nt in enumerate(fnc.no_terminales)}
+        self.terminales: Dict[str, int] = {}
+        self._por_izquierdo: Dict[int, List[Tuple[int, int]]] = {}
+        for r in fnc.reglas:
+            bit_a = 1 << self.ids[r.izquierda]
+            if len(r.derecha) == 1:
+                self.terminales[r.derecha[0]] = self.terminales.get(r.derecha[0], 0) | bit_a
+            else:
+                b, c = r.derecha
+                if b not in self.ids or c not in self.ids:
+                    continue
+                self._por_izquierdo.setdefault(self.ids[b], []).append((1 << self.ids[c], bit_a))
+        self._combinaciones: Dict[Tuple[int, int], int] = {}
+        self._bit_inicio = 1 << self.ids[fnc.simbolo_inicial]
+
+    def _combinar(self, izq: int, der: int) -> int:
+        clave = (izq, der)
+        res = self._combinaciones.get(clave)
+        if res is None:
+            res = 0
+            resto = izq
+            while resto:
+                bajo = resto & -resto
+                for bit_c, bits_a in self._por_izquierdo.get(bajo.bit_length() - 1, ()):
+                    if der & bit_c:
+                        res |= bits_a
+                resto ^= bajo
+            if len(self._combinaciones) > 1000000:
+                self._combinaciones.clear()
+            self._combinaciones[clave] = res
+        return res
+
+    def acepta(self, cadena: str) -> bool:
+        n = len(cadena)
+        if n == 0:
+            return self.fnc.acepta_vacia
+        fila = [self.terminales.get(ch, 0) for ch in cadena]
+        if not all(fila):
+            return False
+        tabla = [fila]
+        combinar = self._combinar
+        for l in range(2, n + 1):
+            fila = []
+            for i in range(n - l + 1):
+                res = 0
+                for k in range(1, l):
+                    izq = tabla[k - 1][i]
+                    if not izq:
+                        continue
+                    der = tabla[l - k - 1][i + k]
+                    if der:
+                        res |= combinar(izq, der)
+                fila.append(res)
+            tabla.append(fila)
+        return bool(tabla[n - 1][0] & self._bit_inicio)
+
+    def acepta_varios(self, cadenas) -> List[bool]:
+        return [self.acepta(c) for c in cadenas]
+
+def compilar_cyk(producciones: List[Produccion], simbolo_inicial: Optional[str] = None) -> CYKCompilado:
+    return CYKCompilado(convertir_a_fnc(producciones, simbolo_inicial=simbolo_inicial))
@@ -1,4 +1,8 @@
+import collections
 import string
+from array import array
+import instrumentacion
+from gramatica_compilada import compilar_gramatica
 
 def _insertar_concat(regex):
     resultado = []
@@ -107,74 +111,246 @@ def _epsilon_cierre(nfa, estados):
                     if d not in cierre:
                         cierre.add(d)
                         pila.append(d)
+    if instrumentacion.ACTIVA:
+        instrumentacion.contar("conversor.epsilon_cierre.llamadas")
+        instrumentacion.contar("conversor.epsilon_cierre.estados", len(cierre))
     return cierre
 
-def _mover(nfa, estados, simbolo):
-    res = set()
-    for e in estados:
-        for s, dests in nfa.trans.get(e, {}).items():
-            if s == simbolo:
-                res.update(dests)
-    return res
+def _bits(mascara):
+    while mascara:
+        bajo = mascara & -mascara
+        yield bajo.bit_length() - 1
+        mascara ^= bajo
 
+class _Subconjuntos:
+    def __init__(self, nfa):
+        estados_nfa = set(nfa.trans.keys()) | {nfa.start} | set(nfa.accepts)
+        cierres = {e: _epsilon_cierre(nfa, {e}) for e in estados_nfa}
+
+        simbolos = set()
+        for m in nfa.trans.values():
+            for s in m.keys():
+                if s is not None:
+                    simbolos.add(s)
+        self.simbolos = sorted(simbolos)
+        self.columnas = {s: i for i, s in enumerate(self.simbolos)}
+
+        importantes = sorted(
+            e for e in estados_nfa
+            if e in nfa.accepts or any(s is not None for s in nfa.trans.get(e, {}))
+        )
+        self._indice = {e: k for k, e in enumerate(importantes)}
+
+        self._saltos = []
+        for e in importantes:
+            fila = {}
+            for s, dests in nfa.trans.get(e, {}).items():
+                if s is None:
+                    continue
+                alcanzados = set()
+                for d in dests:
+                    alcanzados |= cierres[d]
+                fila[self.columnas[s]] = self._mascara_de(alcanzados)
+            self._saltos.append(fila)
+
+        self.aceptos = self._mascara_de(nfa.accepts)
+        self.inicio = self._mascara_de(cierres[nfa.start])
+        self._bloques = {}
+        if instrumentacion.ACTIVA:
+            instrumentacion.contar("conversor.nfa_a_dfa.estados_nfa", len(estados_nfa))
+            instrumentacion.contar("conversor.nfa_a_dfa.cierres", len(cierres))
+
+    def _mascara_de(self, estados):
+        mascara = 0
+        for d in estados:
+            k = self._indice.get(d)
+            if k is not None:
+                mascara |= 1 << k
+        return mascara
+
+    def _bloque(self, j, valor):
+        clave = (j, valor)
+        res = self._bloques.get(clave)
+        if res is None:
+            res = [0] * len(self.simbolos)
+            for e in _bits(valor << (8 * j)):
+                for c, mascara in self._saltos[e].items():
+                    res[c] |= mascara
+            self._bloques[clave] = res
+        return res
+
+    def destinos(self, estado):
+        destinos = [0] * len(self.simbolos)
+        j = 0
+        while estado:
+            valor = estado & 0xFF
+            if valor:
+                for c, mascara in enumerate(self._bloque(j, valor)):
+                    destinos[c] |= mascara
+            estado >>= 8
+            j += 1
+        return destinos
+
+@instrumentacion.medido("conversor.nfa_a_dfa")
 def _nfa_a_dfa(nfa):
-    simbolos = set()
-    for e, m in nfa.trans.items():
-        for s in m.keys():
-            if s is not None:
-                simbolos.add(s)
-    simbolos = sorted(simbolos)
-
-    inicio = frozenset(_epsilon_cierre(nfa, {nfa.start}))
-    pendientes = [inicio]
-    visitados = []
-    trans_dfa = {}
-    aceptos_dfa = set()
+    sub = _Subconjuntos(nfa)
+    simbolos = sub.simbolos
+    mascara_aceptos = sub.aceptos
 
-    while pendientes:
-        estado = pendientes.pop()
-        if estado in visitados:
-            continue
-        visitados.append(estado)
-        trans_dfa[estado] = {}
-        if any(e in nfa.accepts for e in estado):
-            aceptos_dfa.add(estado)
-        for s in simbolos:
-            mov = _mover(nfa, estado, s)
-            if not mov:
+    inicio = sub.inicio
+    ids = {inicio: 0}
+    orden = [inicio]
+    trans_dfa = []
+    i = 0
+    while i < len(orden):
+        estado = orden[i]
+        i += 1
+        destinos = sub.destinos(estado)
+        fila = []
+        for c, destino in enumerate(destinos):
+            if not destino:
                 continue
-            cierre = frozenset(_epsilon_cierre(nfa, mov))
-            trans_dfa[estado][s] = cierre
-            if cierre not in visitados and cierre not in pendientes:
-                pendientes.append(cierre)
+            if destino not in ids:
+                ids[destino] = len(orden)
+                orden.append(destino)
+            fila.append((c, ids[destino]))
+        trans_dfa.append(fila)
+
+    if instrumentacion.ACTIVA:
+        instrumentacion.contar("conversor.nfa_a_dfa.estados_dfa", len(orden))
+        instrumentacion.contar("conversor.nfa_a_dfa.bloques", len(sub._bloques))
 
-    estados_lista = list(visitados)
-    nombres = {e: "q" + str(i) for i, e in enumerate(estados_lista)}
-    estado_inicial = nombres[inicio]
-    estados_finales = [nombres[e] for e in aceptos_dfa]
+    nombres = ["q" + str(k) for k in range(len(orden))]
+    estados_finales = [nombres[k] for k, estado in enumerate(orden) if estado & mascara_aceptos]
 
     transiciones = []
-    for e, m in trans_dfa.items():
-        for s, dest in m.items():
+    for k, fila in enumerate(trans_dfa):
+        for c, destino in fila:
             transiciones.append(
                 {
-                    "origen": nombres[e],
-                    "simbolo": s,
-                    "destino": nombres[dest],
+                    "origen": nombres[k],
+                    "simbolo": simbolos[c],
+                    "destino": nombres[destino],
                 }
             )
 
     automata = {
         "tipo": "AFD",
-        "estados": list(nombres.values()),
+        "estados": nombres,
         "alfabeto": simbolos,
-        "estado_inicial": estado_inicial,
+        "estado_inicial": nombres[0],
         "estados_finales": estados_finales,
         "transiciones": transiciones,
     }
     return automata
 
-def regex_a_afd(regex):
+@instrumentacion.medido("conversor.minimizar_afd")
+def minimizar_afd(automata):
+    alfabeto = list(automata.get("alfabeto", []))
+    estado_inicial = automata.get("estado_inicial")
+    finales = set(automata.get("estados_finales", []))
+    tabla = {}
+    for t in automata.get("transiciones", []):
+        clave = (t.get("origen"), t.get("simbolo"))
+        if clave in tabla and tabla[clave] != t.get("destino"):
+            raise ValueError(f"El automata no es determinista en ({clave[0]}, {clave[1]}).")
+        tabla[clave] = t.get("destino")
+        if t.get("simbolo") not in alfabeto:
+            alfabeto.append(t.get("simbolo"))
+
+    ids = {estado_inicial: 0}
+    nombres = [estado_inicial]
+    i = 0
+    while i < len(nombres):
+        e = nombres[i]
+        i += 1
+        for s in alfabeto:
+            d = tabla.get((e, s))
+            if d is not None and d not in ids:
+                ids[d] = len(nombres)
+                nombres.append(d)
+
+    n = len(nombres)
+    muerto = n
+    delta = [[muerto] * (n + 1) for _ in alfabeto]
+    inversa = [[[] for _ in range(n + 1)] for _ in alfabeto]
+    for c, s in enumerate(alfabeto):
+        fila = delta[c]
+        for q, e in enumerate(nombres):
+            d = tabla.get((e, s))
+            if d is not None:
+                fila[q] = ids[d]
+        for q in range(n + 1):
+            inversa[c][fila[q]].append(q)
+
+    aceptos = {q for q, e in enumerate(nombres) if e in finales}
+    resto = set(range(n + 1)) - aceptos
+    bloques = [set(b) for b in (aceptos, resto) if b]
+    bloque_de = [0] * (n + 1)
+    for b, miembros in enumerate(bloques):
+        for q in miembros:
+            bloque_de[q] = b
+
+    pendientes = {(b, c) for b in range(len(bloques)) for c in range(len(alfabeto))}
+    while pendientes:
+        b, c = pendientes.pop()
+        predecesores = inversa[c]
+        tocados = {}
+        for q in bloques[b]:
+            for p in predecesores[q]:
+                tocados.setdefault(bloque_de[p], set()).add(p)
+        for y, dentro in tocados.items():
+            if len(dentro) == len(bloques[y]):
+                continue
+            bloques[y].difference_update(dentro)
+            nid = len(bloques)
+            bloques.append(dentro)
+            for q in dentro:
+                bloque_de[q] = nid
+            menor = nid if len(dentro) <= len(bloques[y]) else y
+            for c2 in range(len(alfabeto)):
+                if (y, c2) in pendientes:
+                    pendientes.add((nid, c2))
+                else:
+                    pendientes.add((menor, c2))
+
+    bloque_muerto = bloque_de[muerto]
+    inicio = bloque_de[0]
+    orden = [inicio]
+    nuevos = {inicio: 0}
+    transiciones = []
+    i = 0
+    while i < len(orden):
+        b = orden[i]
+        i += 1
+        if b == bloque_muerto:
+            continue
+        representante = next(iter(bloques[b]))
+        for c, s in enumerate(alfabeto):
+            d = bloque_de[delta[c][representante]]
+            if d == bloque_muerto:
+                continue
+            if d not in nuevos:
+                nuevos[d] = len(orden)
+                orden.append(d)
+            transiciones.append({"origen": nuevos[b], "simbolo": s, "destino": nuevos[d]})
+
+    nombres_min = ["q" + str(k) for k in range(len(orden))]
+    for t in transiciones:
+        t["origen"] = nombres_min[t["origen"]]
+        t["destino"] = nombres_min[t["destino"]]
+    estados_finales = [nombres_min[k] for k, b in enumerate(orden) if b != bloque_muerto and bloques[b] & aceptos]
+
+    return {
+        "tipo": "AFD",
+        "estados": nombres_min,
+        "alfabeto": alfabeto,
+        "estado_inicial": nombres_min[0],
+        "estados_finales": estados_finales,
+        "transiciones": transiciones,
+    }
+
+def regex_a_afd(regex, minimizar=True):
     regex = regex.replace(" ", "")
     if not regex:
         raise ValueError("regex vacia")
@@ -182,8 +358,65 @@ def regex_a_afd(regex):
     post = _a_postfijo(con)
     nfa = _nfa_desde_postfijo(post)
     dfa = _nfa_a_dfa(nfa)
+    if minimizar:
+        dfa = minimizar_afd(dfa)
     return dfa
 
+class AFDPerezoso:
+    def __init__(self, nfa, max_estados=1024):
+        if max_estados < 1:
+            raise ValueError("max_estados debe ser al menos 1")
+        self._sub = _Subconjuntos(nfa)
+        self.max_estados = max_estados
+        self.cache = collections.OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def _fila(self, estado):
+        fila = self.cache.get(estado)
+        if fila is None:
+            self.fallos += 1
+            if len(self.cache) >= self.max_estados:
+                self.cache.popitem(last=False)
+                self.desalojos += 1
+            fila = self._sub.destinos(estado)
+            self.cache[estado] = fila
+        else:
+            self.aciertos += 1
+            self.cache.move_to_end(estado)
+        return fila
+
+    def acepta(self, cadena):
+        columnas = self._sub.columnas
+        estado = self._sub.inicio
+        for ch in cadena:
+            c = columnas.get(ch)
+            if c is None:
+                return False
+            estado = self._fila(estado)[c]
+            if not estado:
+                return False
+        return bool(estado & self._sub.aceptos)
+
+    def estadisticas(self):
+        return {
+            "estados_en_cache": len(self.cache),
+            "max_estados": self.max_estados,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+        }
+
+def regex_a_afd_perezoso(regex, max_estados=1024):
+    regex = regex.replace(" ", "")
+    if not regex:
+        raise ValueError("regex vacia")
+    con = _insertar_concat(regex)
+    post = _a_postfijo(con)
+    nfa = _nfa_desde_postfijo(post)
+    return AFDPerezoso(nfa, max_estados=max_estados)
+
 def afd_a_gramatica_regular(automata):
     estados = automata.get("estados", [])
     estado_inicial = automata.get("estado_inicial")
@@ -208,7 +441,210 @@ def afd_a_gramatica_regular(automata):
 
     return "\n".join(lineas)
 
-def regex_a_gramatica_regular(regex):
-    afd = regex_a_afd(regex)
+def regex_a_gramatica_regular(regex, minimizar=True):
+    afd = regex_a_afd(regex, minimizar=minimizar)
     gr = afd_a_gramatica_regular(afd)
     return afd, gr
+
+def gramatica_regular_a_afd(producciones, simbolo_inicial=None):
+    gramatica = compilar_gramatica(producciones)
+    if simbolo_inicial is None:
+        simbolo_inicial = gramatica.texto(gramatica.inicial)
+    nombres = gramatica.nombres
+    nfa = NFA()
+    ids = {}
+
+    def estado(nt):
+        if nt not in ids:
+            ids[nt] = nfa.nuevo_estado()
+        return ids[nt]
+
+    inicio = estado(gramatica.ids.get(simbolo_inicial, -1))
+    final = nfa.nuevo_estado()
+    aceptos = {final}
+    for p in gramatica.producciones:
+        origen = estado(p.izquierda[0])
+        derecha = p.derecha
+        if not derecha:
+            aceptos.add(origen)
+        elif len(derecha) == 1:
+            nfa.agregar(origen, nombres[derecha[0]], final)
+        else:
+            nfa.agregar(origen, nombres[derecha[0]], estado(derecha[1]))
+    nfa.start = inicio
+    nfa.accepts = aceptos
+    return _nfa_a_dfa(nfa)
+
+def _tabla_afd(automata):
+    tabla = {}
+    for t in automata.get("transiciones", []):
+        tabla[(t.get("origen"), t.get("simbolo"))] = t.get("destino")
+    return tabla
+
+def _buscar(padres, x):
+    raiz = x
+    while padres.setdefault(raiz, raiz) != raiz:
+        raiz = padres[raiz]
+    while padres[x] != raiz:
+        padres[x], x = raiz, padres[x]
+    return raiz
+
+def _contraejemplo_mas_corto(inicio, alfabeto, tabla1, tabla2, finales1, finales2):
+    padre = {inicio: None}
+    cola = collections.deque([inicio])
+    while cola:
+        par = cola.popleft()
+        p, q = par
+        if (p in finales1) != (q in finales2):
+            simbolos = []
+            while padre[par] is not None:
+                par, s = padre[par]
+                simbolos.append(s)
+            return "".join(reversed(simbolos))
+        for s in alfabeto:
+            sig = (tabla1.get((p, s)), tabla2.get((q, s)))
+            if sig not in padre:
+                padre[sig] = (par, s)
+                cola.append(sig)
+    return None
+
+def afd_acepta(automata, cadena):
+    tabla = _tabla_afd(automata)
+    estado = automata.get("estado_inicial")
+    for s in cadena:
+        estado = tabla.get((estado, s))
+        if estado is None:
+            return False
+    return estado in set(automata.get("estados_finales", []))
+
+def afd_equivalentes(afd1, afd2):
+    alfabeto = sorted(set(afd1.get("alfabeto", [])) | set(afd2.get("alfabeto", [])))
+    tabla1 = _tabla_afd(afd1)
+    tabla2 = _tabla_afd(afd2)
+    finales1 = set(afd1.get("estados_finales", []))
+    finales2 = set(afd2.get("estados_finales", []))
+    inicio = (afd1.get("estado_inicial"), afd2.get("estado_inicial"))
+
+    padres = {}
+    a, b = (1, inicio[0]), (2, inicio[1])
+    padres[_buscar(padres, a)] = _buscar(padres, b)
+    pendientes = collections.deque([inicio])
+    equivalentes = True
+    while pendientes:
+        p, q = pendientes.popleft()
+        if (p in finales1) != (q in finales2):
+            equivalentes = False
+            break
+        for s in alfabeto:
+            r1 = _buscar(padres, (1, tabla1.get((p, s))))
+            r2 = _buscar(padres, (2, tabla2.get((q, s))))
+            if r1 != r2:
+                padres[r1] = r2
+                pendientes.append((tabla1.get((p, s)), tabla2.get((q, s))))
+    if equivalentes:
+        return True, None
+    return False, _contraejemplo_mas_corto(inicio, alfabeto, tabla1, tabla2, finales1, finales2)
+
+class AFDCompilado:
+    def __init__(self, automata):
+        estados = list(automata.get("estados", []))
+        alfabeto = list(automata.get("alfabeto", []))
+        transiciones = automata.get("transiciones", [])
+        for t in transiciones:
+            for e in (t.get("origen"), t.get("destino")):
+                if e not in estados:
+                    estados.append(e)
+            if t.get("simbolo") not in alfabeto:
+                alfabeto.append(t.get("simbolo"))
+        inicial = automata.get("estado_inicial")
+        if inicial not in estados:
+            estados.append(inicial)
+
+        self.estados = estados
+        self.alfabeto = alfabeto
+        self.ids = {e: i for i, e in enumerate(estados)}
+        self.columnas = {s: c for c, s in enumerate(alfabeto)}
+        self.muerto = len(estados)
+        self.ancho = len(alfabeto) + 1
+        ancho = self.ancho
+
+        self.tabla = array("i", [self.muerto * ancho]) * ((self.muerto + 1) * ancho)
+        for t in transiciones:
+            pos = self.ids[t.get("origen")] * ancho + self.columnas[t.get("simbolo")]
+            destino = self.ids[t.get("destino")] * ancho
+            if self.tabla[pos] != self.muerto * ancho and self.tabla[pos] != destino:
+                raise ValueError(f"El automata no es determinista en ({t.get('origen')}, {t.get('simbolo')}).")
+            self.tabla[pos] = destino
+
+        self.finales = bytearray(self.muerto + 1)
+        for f in automata.get("estados_finales", []):
+            if f in self.ids:
+                self.finales[self.ids[f]] = 1
+        self.inicio = self.ids[inicial] * ancho
+
+        self._traduccion = None
+        if len(alfabeto) < 255 and all(isinstance(s, str) and len(s) == 1 and ord(s) < 256 for s in alfabeto):
+            traduccion = bytearray([len(alfabeto)]) * 256
+            for s, c in self.columnas.items():
+                traduccion[ord(s)] = c
+            self._traduccion = bytes(traduccion)
+
+    def _codificar(self, cadena):
+        if self._traduccion is not None and isinstance(cadena, str):
+            try:
+                return cadena.encode("latin-1").translate(self._traduccion)
+            except UnicodeEncodeError:
+                pass
+        otro = self.ancho - 1
+        return [self.columnas.get(s, otro) for s in cadena]
+
+    def avanzar(self, q, cadena):
+        tabla = self.tabla
+        for c in self._codificar(cadena):
+            q = tabla[q + c]
+        return q
+
+    def es_final(self, q):
+        return self.finales[q // self.ancho] == 1
+
+    def acepta(self, cadena):
+        return self.es_final(self.avanzar(self.inicio, cadena))
+
+    def acepta_varios(self, cadenas):
+        tabla = self.tabla
+        inicio = self.inicio
+        ancho = self.ancho
+        finales = self.finales
+        resultados = bytearray()
+        for cadena in cadenas:
+            q = inicio
+            for c in self._codificar(cadena):
+                q = tabla[q + c]
+            resultados.append(finales[q // ancho])
+        return resultados
+
+    def acepta_misma_longitud(self, cadenas):
+        cadenas = list(cadenas)
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        longitud = len(cadenas[0]) if cadenas else 0
+        if any(len(c) != longitud for c in cadenas):
+            raise ValueError("Todas las cadenas deben tener la misma longitud.")
+        if np is None or self._traduccion is None or not cadenas:
+            return self.acepta_varios(cadenas)
+        try:
+            crudo = "".join(cadenas).encode("latin-1").translate(self._traduccion)
+        except UnicodeEncodeError:
+            return self.acepta_varios(cadenas)
+        simbolos = np.frombuffer(crudo, dtype=np.uint8).reshape(len(cadenas), longitud)
+        tabla = np.frombuffer(self.tabla, dtype=np.int32)
+        q = np.full(len(cadenas), self.inicio, dtype=np.int32)
+        for j in range(longitud):
+            q = tabla[q + simbolos[:, j]]
+        finales = np.frombuffer(bytes(self.finales), dtype=np.uint8)
+        return bytearray(finales[q // self.ancho].tobytes())
+
+def compilar_afd(automata):
+    return AFDCompilado(automata)
@@ -32,25 +32,39 @@ def obtener_ejemplo_automata(tipo: int) -> str:
             "tipo": "AP",
             "estados": ["q0", "q1", "qf"],
             "alfabeto": ["a", "b"],
+            "alfabeto_pila": ["Z", "A"],
+            "simbolo_inicial_pila": "Z",
             "estado_inicial": "q0",
             "estados_finales": ["qf"],
             "transiciones": [
-                {"origen": "q0", "simbolo": "a", "destino": "q0"},
-                {"origen": "q0", "simbolo": "b", "destino": "q1"},
-                {"origen": "q1", "simbolo": "b", "destino": "qf"},
+                {"origen": "q0", "simbolo": "a", "desapila": "", "apila": "A", "destino": "q0"},
+                {"origen": "q0", "simbolo": "b", "desapila": "A", "apila": "", "destino": "q1"},
+                {"origen": "q1", "simbolo": "b", "desapila": "A", "apila": "", "destino": "q1"},
+                {"origen": "q1", "simbolo": "", "desapila": "Z", "apila": "Z", "destino": "qf"},
             ],
         }
         return json.dumps(data, indent=2)
     if tipo == 0:
         data = {
             "tipo": "MT",
-            "estados": ["q0", "q1", "qf"],
-            "alfabeto": ["a", "b", "_"],
+            "estados": ["q0", "q1", "q2", "q3", "qf"],
+            "alfabeto": ["a", "b"],
+            "alfabeto_cinta": ["a", "b", "X", "Y", "_"],
+            "simbolo_blanco": "_",
             "estado_inicial": "q0",
             "estados_finales": ["qf"],
             "transiciones": [
-                {"origen": "q0", "simbolo": "a", "destino": "q1"},
-                {"origen": "q1", "simbolo": "b", "destino": "qf"},
+                {"origen": "q0", "simbolo": "a", "escribe": "X", "mueve": "R", "destino": "q1"},
+                {"origen": "q0", "simbolo": "Y", "escribe": "Y", "mueve": "R", "destino": "q3"},
+                {"origen": "q0", "simbolo": "_", "escribe": "_", "mueve": "S", "destino": "qf"},
+                {"origen": "q1", "simbolo": "a", "escribe": "a", "mueve": "R", "destino": "q1"},
+                {"origen": "q1", "simbolo": "Y", "escribe": "Y", "mueve": "R", "destino": "q1"},
+                {"origen": "q1", "simbolo": "b", "escribe": "Y", "mueve": "L", "destino": "q2"},
+                {"origen": "q2", "simbolo": "a", "escribe": "a", "mueve": "L", "destino": "q2"},
+                {"origen": "q2", "simbolo": "Y", "escribe": "Y", "mueve": "L", "destino": "q2"},
+                {"origen": "q2", "simbolo": "X", "escribe": "X", "mueve": "R", "destino": "q0"},
+                {"origen": "q3", "simbolo": "Y", "escribe": "Y", "mueve": "R", "destino": "q3"},
+                {"origen": "q3", "simbolo": "_", "escribe": "_", "mueve": "S", "destino": "qf"},
             ],
         }
         return json.dumps(data, indent=2)
@@ -0,0 +1,97 @@
+import re
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+from analizador_gramatica import Produccion
+
+NOMBRE_NO_TERMINAL_RE = re.compile(r'[A-Z](?:[a-z]{2,}|[a-z]*[0-9_])[A-Za-z0-9_]*')
+CANDIDATO_NOMBRE_RE = re.compile(r'[A-Z][A-Za-z0-9_]+')
+
+
+def es_no_terminal(s: str) -> bool:
+    if len(s) == 1:
+        return s.isupper()
+    return NOMBRE_NO_TERMINAL_RE.fullmatch(s) is not None
+
+
+class ProduccionCompilada:
+    __slots__ = ("izquierda", "derecha", "indice")
+
+    def __init__(self, izquierda: Tuple[int, ...], derecha: Tuple[int, ...], indice: int):
+        self.izquierda = izquierda
+        self.derecha = derecha
+        self.indice = indice
+
+    def __repr__(self) -> str:
+        return f"ProduccionCompilada({self.izquierda!r}, {self.derecha!r}, {self.indice})"
+
+
+class GramaticaCompilada:
+    def __init__(self, originales: List[Produccion], multi: Iterable[str] = ()):
+        self.originales: List[Produccion] = []
+        self.nombres: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.no_terminal = bytearray()
+        self.producciones: List[ProduccionCompilada] = []
+        self.por_izquierda: Dict[int, List[ProduccionCompilada]] = {}
+        self.inicial: Tuple[int, ...] = ()
+        self.tokenizacion_cambiada = False
+
+        self._multi = set(multi)
+        self._multi.update(p.izquierda for p in originales if len(p.izquierda) > 1 and es_no_terminal(p.izquierda))
+        for p in originales:
+            self.agregar(p)
+
+    def agregar(self, produccion: Produccion) -> ProduccionCompilada:
+        if len(produccion.izquierda) > 1 and produccion.izquierda not in self._multi and es_no_terminal(produccion.izquierda):
+            self._multi.add(produccion.izquierda)
+            if self.producciones:
+                self.tokenizacion_cambiada = True
+        izquierda = self.codificar(produccion.izquierda)
+        derecha = self.codificar(produccion.derecha)
+        prod = ProduccionCompilada(izquierda, derecha, len(self.producciones))
+        self.originales.append(produccion)
+        self.producciones.append(prod)
+        if len(izquierda) == 1 and self.no_terminal[izquierda[0]]:
+            self.por_izquierda.setdefault(izquierda[0], []).append(prod)
+        if len(self.producciones) == 1:
+            self.inicial = izquierda
+        return prod
+
+    def simbolo(self, nombre: str) -> int:
+        i = self.ids.get(nombre)
+        if i is None:
+            i = len(self.nombres)
+            self.ids[nombre] = i
+            self.nombres.append(nombre)
+            self.no_terminal.append(1 if es_no_terminal(nombre) else 0)
+        return i
+
+    def tokenizar(self, texto: str) -> List[str]:
+        if not self._multi:
+            return list(texto)
+        tokens: List[str] = []
+        i = 0
+        n = len(texto)
+        while i < n:
+            m = CANDIDATO_NOMBRE_RE.match(texto, i)
+            paso = 1
+            if m is not None:
+                candidato = m.group()
+                for largo in range(len(candidato), 1, -1):
+                    if candidato[:largo] in self._multi:
+                        paso = largo
+                        break
+            tokens.append(texto[i:i + paso])
+            i += paso
+        return tokens
+
+    def codificar(self, texto: str) -> Tuple[int, ...]:
+        return tuple(self.simbolo(t) for t in self.tokenizar(texto))
+
+    def texto(self, simbolos: Sequence[int]) -> str:
+        return "".join(self.nombres[s] for s in simbolos)
+
+
+def compilar_gramatica(producciones: Union[List[Produccion], GramaticaCompilada]) -> GramaticaCompilada:
+    if isinstance(producciones, GramaticaCompilada):
+        return producciones
+    return GramaticaCompilada(producciones)
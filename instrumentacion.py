@@ -0,0 +1,106 @@
+import functools
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+ACTIVA = False
+
+_lock = threading.Lock()
+_contadores: Dict[str, int] = {}
+_tiempos: Dict[str, list] = {}
+
+
+def activar() -> None:
+    global ACTIVA
+    ACTIVA = True
+
+
+def desactivar() -> None:
+    global ACTIVA
+    ACTIVA = False
+
+
+def reiniciar() -> None:
+    with _lock:
+        _contadores.clear()
+        _tiempos.clear()
+
+
+def contar(nombre: str, n: int = 1) -> None:
+    with _lock:
+        _contadores[nombre] = _contadores.get(nombre, 0) + n
+
+
+def registrar_tiempo(nombre: str, segundos: float) -> None:
+    with _lock:
+        t = _tiempos.get(nombre)
+        if t is None:
+            _tiempos[nombre] = [1, segundos, segundos]
+        else:
+            t[0] += 1
+            t[1] += segundos
+            if segundos > t[2]:
+                t[2] = segundos
+
+
+def medido(nombre: str) -> Callable:
+    def decorar(funcion: Callable) -> Callable:
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not ACTIVA:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                registrar_tiempo(nombre, time.perf_counter() - inicio)
+
+        return envoltura
+
+    return decorar
+
+
+def instantanea() -> Dict[str, Any]:
+    with _lock:
+        return {
+            "contadores": dict(_contadores),
+            "tiempos": {
+                nombre: {"llamadas": t[0], "total_ms": t[1] * 1000, "max_ms": t[2] * 1000}
+                for nombre, t in _tiempos.items()
+            },
+        }
+
+
+def fusionar(destino: Dict[str, Any], origen: Dict[str, Any]) -> Dict[str, Any]:
+    contadores = destino.setdefault("contadores", {})
+    for nombre, n in origen.get("contadores", {}).items():
+        contadores[nombre] = contadores.get(nombre, 0) + n
+    tiempos = destino.setdefault("tiempos", {})
+    for nombre, t in origen.get("tiempos", {}).items():
+        actual = tiempos.get(nombre)
+        if actual is None:
+            tiempos[nombre] = dict(t)
+        else:
+            actual["llamadas"] += t["llamadas"]
+            actual["total_ms"] += t["total_ms"]
+            actual["max_ms"] = max(actual["max_ms"], t["max_ms"])
+    return destino
+
+
+def formatear(datos: Optional[Dict[str, Any]] = None) -> str:
+    datos = datos if datos is not None else instantanea()
+    lineas = []
+    for nombre, t in sorted(datos["tiempos"].items(), key=lambda x: -x[1]["total_ms"]):
+        lineas.append(f"{nombre}: {t['llamadas']} llamadas, {t['total_ms']:.1f} ms (max {t['max_ms']:.1f} ms)")
+    if lineas and datos["contadores"]:
+        lineas.append("")
+    for nombre, n in sorted(datos["contadores"].items()):
+        lineas.append(f"{nombre}: {n}")
+    return "\n".join(lineas)
+
+
+def volcar_json(ruta: str, datos: Optional[Dict[str, Any]] = None) -> None:
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(datos if datos is not None else instantanea(), f, indent=2)
+        f.write("\n")
@@ -0,0 +1,179 @@
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterable, Iterator, Optional
+
+import instrumentacion
+from automatas import cargar_automata_desde_json
+from cache_clasificacion import (
+    clasificar_automata_cacheada,
+    clasificar_gramatica_cacheada,
+    configurar_cache,
+)
+
+EXTENSIONES_AUTOMATA = (".json",)
+EXTENSIONES_GRAMATICA = (".txt", ".gram", ".gr")
+
+
+def _leer_archivo(ruta: str) -> Dict:
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            contenido = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return {"id": ruta, "error_entrada": f"No se pudo leer el archivo: {e}"}
+    if ruta.lower().endswith(EXTENSIONES_AUTOMATA):
+        return {"id": ruta, "automata": contenido}
+    return {"id": ruta, "gramatica": contenido}
+
+
+def _recorrer_rutas(rutas: Iterable[str]) -> Iterator[Dict]:
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            for base, _, archivos in os.walk(ruta):
+                for nombre in sorted(archivos):
+                    if nombre.lower().endswith(EXTENSIONES_AUTOMATA + EXTENSIONES_GRAMATICA):
+                        yield _leer_archivo(os.path.join(base, nombre))
+        else:
+            yield _leer_archivo(ruta)
+
+
+def _leer_jsonl(flujo) -> Iterator[Dict]:
+    for num, linea in enumerate(flujo, start=1):
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            item = json.loads(linea)
+        except json.JSONDecodeError as e:
+            yield {"id": f"linea {num}", "error_entrada": f"JSON no valido: {e}"}
+            continue
+        item.setdefault("id", f"linea {num}")
+        yield item
+
+
+def procesar_item(item: Dict, con_explicacion: bool = True) -> Dict:
+    if instrumentacion.ACTIVA:
+        instrumentacion.reiniciar()
+    inicio = time.perf_counter()
+    salida: Dict = {"id": item.get("id")}
+    try:
+        if "error_entrada" in item:
+            raise ValueError(item["error_entrada"])
+        if "gramatica" in item:
+            salida["entrada"] = "gramatica"
+            resultado = clasificar_gramatica_cacheada(item["gramatica"])
+        elif "automata" in item:
+            salida["entrada"] = "automata"
+            automata = item["automata"]
+            if not isinstance(automata, str):
+                automata = json.dumps(automata)
+            resultado = clasificar_automata_cacheada(cargar_automata_desde_json(automata))
+        else:
+            raise ValueError("El elemento no tiene campo 'gramatica' ni 'automata'.")
+        salida["tipo"] = resultado.tipo
+        salida["etiqueta"] = resultado.etiqueta
+        if con_explicacion:
+            salida["explicacion"] = list(resultado.explicacion)
+    except Exception as e:
+        salida["error"] = str(e)
+    salida["segundos"] = time.perf_counter() - inicio
+    if instrumentacion.ACTIVA:
+        salida["metricas"] = instrumentacion.instantanea()
+    return salida
+
+
+def _procesar_sin_explicacion(item: Dict) -> Dict:
+    return procesar_item(item, con_explicacion=False)
+
+
+def _iniciar_proceso(max_cache: int, ruta_cache: Optional[str], instrumentar: bool = False) -> None:
+    configurar_cache(max_entradas=max_cache, ruta_disco=ruta_cache)
+    if instrumentar:
+        instrumentacion.activar()
+
+
+def clasificar_lote(
+    items: Iterable[Dict],
+    procesos: int = 0,
+    ordenado: bool = True,
+    tam_bloque: int = 64,
+    max_cache: int = 4096,
+    ruta_cache: Optional[str] = None,
+    con_explicacion: bool = True,
+    instrumentar: bool = False,
+) -> Iterator[Dict]:
+    procesos = procesos or os.cpu_count() or 1
+    tarea = procesar_item if con_explicacion else _procesar_sin_explicacion
+    if procesos == 1:
+        _iniciar_proceso(max_cache, ruta_cache, instrumentar)
+        for item in items:
+            yield tarea(item)
+        return
+    import multiprocessing
+
+    with multiprocessing.Pool(procesos, initializer=_iniciar_proceso, initargs=(max_cache, ruta_cache, instrumentar)) as pool:
+        if ordenado:
+            resultados = pool.imap(tarea, items, chunksize=tam_bloque)
+        else:
+            resultados = pool.imap_unordered(tarea, items, chunksize=tam_bloque)
+        for r in resultados:
+            yield r
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Clasifica gramaticas y automatas en lote (sin interfaz grafica)."
+    )
+    parser.add_argument("rutas", nargs="*", help="Archivos o directorios (.json = automata, .txt/.gram/.gr = gramatica).")
+    parser.add_argument("--jsonl", help="Archivo JSONL con objetos {'id', 'gramatica'} o {'id', 'automata'}; '-' lee de stdin.")
+    parser.add_argument("--procesos", type=int, default=0, help="Numero de procesos (por defecto, uno por nucleo).")
+    parser.add_argument("--desordenado", action="store_true", help="Emitir resultados a medida que terminan.")
+    parser.add_argument("--tam-bloque", type=int, default=64, help="Elementos enviados a cada proceso por tanda.")
+    parser.add_argument("--max-cache", type=int, default=4096, help="Entradas de la cache en memoria de cada proceso.")
+    parser.add_argument("--cache-disco", help="Archivo SQLite para conservar resultados entre ejecuciones.")
+    parser.add_argument("--sin-explicacion", action="store_true", help="Omitir la explicacion (solo tipo y etiqueta).")
+    parser.add_argument("--metricas", help="Archivo JSON donde volcar contadores y tiempos de instrumentacion.")
+    parser.add_argument("--max-lentos", type=int, default=10, help="Elementos mas lentos a listar en el volcado de metricas.")
+    args = parser.parse_args(argv)
+
+    if not args.rutas and not args.jsonl:
+        parser.error("indica al menos una ruta o --jsonl")
+
+    def items() -> Iterator[Dict]:
+        yield from _recorrer_rutas(args.rutas)
+        if args.jsonl == "-":
+            yield from _leer_jsonl(sys.stdin)
+        elif args.jsonl:
+            with open(args.jsonl, encoding="utf-8") as f:
+                yield from _leer_jsonl(f)
+
+    resultados = clasificar_lote(
+        items(),
+        procesos=args.procesos,
+        ordenado=not args.desordenado,
+        tam_bloque=args.tam_bloque,
+        max_cache=args.max_cache,
+        ruta_cache=args.cache_disco,
+        con_explicacion=not args.sin_explicacion,
+        instrumentar=bool(args.metricas),
+    )
+    totales: Dict = {}
+    lentos = []
+    for r in resultados:
+        metricas = r.pop("metricas", None)
+        if metricas is not None:
+            instrumentacion.fusionar(totales, metricas)
+            lentos.append({"id": r["id"], "segundos": r["segundos"], "metricas": metricas})
+            lentos = sorted(lentos, key=lambda x: -x["segundos"])[: args.max_lentos]
+        sys.stdout.write(json.dumps(r, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+    if args.metricas:
+        totales["mas_lentos"] = lentos
+        instrumentacion.volcar_json(args.metricas, totales)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,35 @@
-import os
-import tempfile
+import base64
+import queue
+import threading
+import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, messagebox, filedialog
 
-from clasificador import clasificar_gramatica_texto, comparar_gramaticas_texto
-from automatas import cargar_automata_desde_json, clasificar_automata
+import instrumentacion
+from cache_clasificacion import (
+    clasificar_gramatica_cacheada,
+    clasificar_automata_cacheada,
+    comparar_gramaticas_cacheada,
+)
+from automatas import (
+    cargar_automata_desde_json,
+    minimizar_automata,
+    motivo_no_minimizable,
+    automata_a_json,
+)
 from ejemplos import (
     obtener_ejemplo_gramatica,
     obtener_ejemplo_automata,
     generar_gramatica_aleatoria,
 )
 from tutor import generar_ejercicio, evaluar_respuesta
-from visualizador import dibujar_gramatica, dibujar_automata
-from reportes import generar_reporte_pdf
+from clasificador import ClasificadorPorLineas
+from tipos import TYPE_LABELS
+
+RETARDO_CLASIFICACION_MS = 20
+INTERVALO_SONDEO_MS = 50
+INTERVALO_METRICAS_MS = 1000
 
 
 def parsear_gramatica_simple(texto: str):
@@ -39,6 +56,118 @@ def parsear_gramatica_simple(texto: str):
     return producciones
 
 
+class TareaCancelada(Exception):
+    pass
+
+
+class PlanificadorTareas:
+    def __init__(self, root: tk.Tk, max_hilos: int = 2):
+        self.root = root
+        self._ejecutor = ThreadPoolExecutor(max_workers=max_hilos)
+        self._ejecutor_fondo = ThreadPoolExecutor(max_workers=1)
+        self._fondo_pendiente = None
+        self._fondo_en_espera = {}
+        self._cola: "queue.Queue" = queue.Queue()
+        self._activas = {}
+        self._siguiente_id = 0
+        self._sondeando = False
+
+    def enviar(self, canal, funcion, al_terminar, al_progresar=None, al_fallar=None, segundo_plano=False):
+        if segundo_plano and self._fondo_pendiente is not None and not self._fondo_pendiente.done():
+            self._fondo_en_espera.pop(canal, None)
+            self._fondo_en_espera[canal] = (funcion, al_terminar, al_progresar, al_fallar)
+            if not self._sondeando:
+                self._sondeando = True
+                self.root.after(INTERVALO_SONDEO_MS, self._sondear)
+            return None
+        self.cancelar(canal)
+        self._siguiente_id += 1
+        id_tarea = self._siguiente_id
+        cancelada = threading.Event()
+        self._activas[canal] = (id_tarea, cancelada, al_terminar, al_progresar, al_fallar)
+        ultimo_aviso = [0.0]
+
+        def progreso(valor):
+            if cancelada.is_set():
+                raise TareaCancelada()
+            ahora = time.monotonic()
+            if ahora - ultimo_aviso[0] >= INTERVALO_SONDEO_MS / 1000:
+                ultimo_aviso[0] = ahora
+                self._cola.put((canal, id_tarea, "progreso", valor))
+
+        def ejecutar():
+            try:
+                resultado = funcion(progreso)
+            except TareaCancelada:
+                self._cola.put((canal, id_tarea, "cancelada", None))
+            except Exception as e:
+                self._cola.put((canal, id_tarea, "error", e))
+            else:
+                self._cola.put((canal, id_tarea, "ok", resultado))
+
+        if segundo_plano:
+            self._fondo_pendiente = self._ejecutor_fondo.submit(ejecutar)
+        else:
+            self._ejecutor.submit(ejecutar)
+        if not self._sondeando:
+            self._sondeando = True
+            self.root.after(INTERVALO_SONDEO_MS, self._sondear)
+        return id_tarea
+
+    def cancelar(self, canal) -> bool:
+        en_espera = self._fondo_en_espera.pop(canal, None)
+        activa = self._activas.pop(canal, None)
+        if activa is None:
+            return en_espera is not None
+        activa[1].set()
+        return True
+
+    def cancelar_todas(self):
+        self._fondo_en_espera.clear()
+        for canal in list(self._activas):
+            self.cancelar(canal)
+
+    def en_curso(self, canal) -> bool:
+        return canal in self._activas
+
+    def cerrar(self):
+        self.cancelar_todas()
+        self._ejecutor.shutdown(wait=False, cancel_futures=True)
+        self._ejecutor_fondo.shutdown(wait=False, cancel_futures=True)
+
+    def _sondear(self):
+        while True:
+            try:
+                canal, id_tarea, evento, valor = self._cola.get_nowait()
+            except queue.Empty:
+                break
+            activa = self._activas.get(canal)
+            if activa is None or activa[0] != id_tarea:
+                continue
+            _, _, al_terminar, al_progresar, al_fallar = activa
+            if evento == "progreso":
+                if al_progresar is not None:
+                    al_progresar(valor)
+                continue
+            del self._activas[canal]
+            if evento == "ok":
+                al_terminar(valor)
+            elif evento == "error" and al_fallar is not None:
+                al_fallar(valor)
+        if self._fondo_en_espera and self._fondo_pendiente.done():
+            canal = next(iter(self._fondo_en_espera))
+            funcion, al_terminar, al_progresar, al_fallar = self._fondo_en_espera.pop(canal)
+            self.enviar(canal, funcion, al_terminar, al_progresar, al_fallar, segundo_plano=True)
+        if self._activas or self._fondo_en_espera:
+            self.root.after(INTERVALO_SONDEO_MS, self._sondear)
+        else:
+            self._sondeando = False
+
+
+def _png_base64(datos: bytes) -> str:
+    return base64.b64encode(datos).decode("ascii")
+
+
 class App:
     def __init__(self, root: tk.Tk):
         self.root = root
@@ -49,6 +178,9 @@ class App:
         self.imagen_gram = None
         self.imagen_auto = None
         self.ejercicio_tutor = None
+        self.clasificador_vivo = ClasificadorPorLineas()
+        self._reclasificacion_pendiente = None
+        self.tareas = PlanificadorTareas(root)
 
         self.crear_interfaz()
 
@@ -56,23 +188,63 @@ class App:
         notebook = ttk.Notebook(self.root)
         notebook.pack(fill="both", expand=True)
 
+        barra_estado = ttk.Frame(self.root)
+        barra_estado.pack(fill="x", side="bottom")
+        self.lbl_estado = ttk.Label(barra_estado, text="")
+        self.lbl_estado.pack(side="left", padx=5, pady=2)
+        btn_cancelar = ttk.Button(barra_estado, text="Cancelar", command=self.cancelar_tareas)
+        btn_cancelar.pack(side="right", padx=5, pady=2)
+
         frame_gram = ttk.Frame(notebook)
         frame_auto = ttk.Frame(notebook)
         frame_comp = ttk.Frame(notebook)
         frame_gen = ttk.Frame(notebook)
         frame_tutor = ttk.Frame(notebook)
+        frame_metricas = ttk.Frame(notebook)
 
         notebook.add(frame_gram, text="Clasificar gramatica")
         notebook.add(frame_auto, text="Clasificar automata")
         notebook.add(frame_comp, text="Comparar gramatica")
         notebook.add(frame_gen, text="Generador")
         notebook.add(frame_tutor, text="Tutor")
+        notebook.add(frame_metricas, text="Rendimiento")
 
         self.crear_tab_gramatica(frame_gram)
         self.crear_tab_automata(frame_auto)
         self.crear_tab_comparar(frame_comp)
         self.crear_tab_generador(frame_gen)
         self.crear_tab_tutor(frame_tutor)
+        self.crear_tab_metricas(frame_metricas)
+
+    def estado(self, texto: str):
+        self.lbl_estado.config(text=texto)
+
+    def cancelar_tareas(self):
+        self.tareas.cancelar_todas()
+        self.estado("Operacion cancelada.")
+
+    def _mostrar_imagen(self, titulo: str, datos_png: str):
+        top = tk.Toplevel(self.root)
+        top.title(titulo)
+        img = tk.PhotoImage(data=datos_png)
+        lbl_img = tk.Label(top, image=img)
+        lbl_img.image = img
+        lbl_img.pack(padx=10, pady=10)
+        return img
+
+    def _prerenderizar(self, funcion: str, objeto):
+        def renderizar(progreso):
+            import visualizador
+
+            getattr(visualizador, funcion)(objeto)
+
+        self.tareas.enviar("prerender_" + funcion, renderizar, lambda _: None, segundo_plano=True)
+
+    def _fallo(self, mensaje: str):
+        def mostrar(error):
+            self.estado("")
+            messagebox.showerror("Error", f"{mensaje}:\n{error}")
+        return mostrar
 
     def crear_tab_gramatica(self, frame):
         frame.columnconfigure(0, weight=1)
@@ -84,6 +256,8 @@ class App:
         self.txt_gram = tk.Text(frame, height=8)
         self.txt_gram.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
         self.txt_gram.insert("1.0", obtener_ejemplo_gramatica(3))
+        self.txt_gram.edit_modified(False)
+        self.txt_gram.bind("<<Modified>>", self._al_modificar_gramatica)
 
         cont_botones = ttk.Frame(frame)
         cont_botones.grid(row=2, column=0, sticky="w", padx=5, pady=5)
@@ -101,6 +275,15 @@ class App:
         )
         btn_pdf.grid(row=0, column=2, padx=2)
 
+        self.var_clasificar_vivo = tk.BooleanVar(value=True)
+        chk_vivo = ttk.Checkbutton(
+            cont_botones,
+            text="Clasificar mientras escribo",
+            variable=self.var_clasificar_vivo,
+            command=self._reclasificar_en_vivo,
+        )
+        chk_vivo.grid(row=0, column=3, padx=8)
+
         self.lbl_tipo_gram = ttk.Label(frame, text="Tipo: ")
         self.lbl_tipo_gram.grid(row=3, column=0, sticky="w", padx=5, pady=5)
 
@@ -116,33 +299,64 @@ class App:
             messagebox.showwarning("Aviso", "Ingresa una gramatica.")
             return
         try:
-            resultado = clasificar_gramatica_texto(texto)
+            resultado = clasificar_gramatica_cacheada(texto)
             self.resultado_gram = resultado
             self.lbl_tipo_gram.config(text="Tipo: " + resultado.etiqueta)
             self.txt_exp_gram.delete("1.0", "end")
             for linea in resultado.explicacion:
                 self.txt_exp_gram.insert("end", linea + "\n")
+            self._prerenderizar("imagen_gramatica", parsear_gramatica_simple(texto))
         except Exception as e:
             messagebox.showerror("Error", f"Error al analizar la gramatica:\n{e}")
 
+    def _al_modificar_gramatica(self, event=None):
+        if not self.txt_gram.edit_modified():
+            return
+        self.txt_gram.edit_modified(False)
+        if not self.var_clasificar_vivo.get():
+            return
+        if self._reclasificacion_pendiente is not None:
+            self.root.after_cancel(self._reclasificacion_pendiente)
+        self._reclasificacion_pendiente = self.root.after(
+            RETARDO_CLASIFICACION_MS, self._reclasificar_en_vivo
+        )
+
+    def _reclasificar_en_vivo(self):
+        self._reclasificacion_pendiente = None
+        if not self.var_clasificar_vivo.get():
+            return
+        texto = self.txt_gram.get("1.0", "end")
+        analisis, errores = self.clasificador_vivo.analizar(texto)
+        if errores:
+            self.lbl_tipo_gram.config(text=f"Tipo: (linea {errores[0].linea} no valida)")
+        elif analisis is None:
+            self.lbl_tipo_gram.config(text="Tipo: ")
+        else:
+            self.lbl_tipo_gram.config(text="Tipo: " + TYPE_LABELS[analisis.tipo])
+
     def ver_diagrama_gramatica(self):
         texto = self.txt_gram.get("1.0", "end").strip()
         if not texto:
             messagebox.showwarning("Aviso", "Ingresa una gramatica.")
             return
-        try:
-            producciones = parsear_gramatica_simple(texto)
-            with tempfile.TemporaryDirectory() as tmpdir:
-                ruta_base = os.path.join(tmpdir, "gramatica_diagrama")
-                ruta_img = dibujar_gramatica(producciones, ruta_base)
-                top = tk.Toplevel(self.root)
-                top.title("Diagrama de gramatica")
-                img = tk.PhotoImage(file=ruta_img)
-                self.imagen_gram = img
-                lbl_img = tk.Label(top, image=img)
-                lbl_img.pack(padx=10, pady=10)
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo generar el diagrama:\n{e}")
+        producciones = parsear_gramatica_simple(texto)
+
+        def renderizar(progreso):
+            from visualizador import imagen_gramatica
+
+            return _png_base64(imagen_gramatica(producciones))
+
+        def mostrar(datos_png):
+            self.estado("")
+            self.imagen_gram = self._mostrar_imagen("Diagrama de gramatica", datos_png)
+
+        self.estado("Generando diagrama de la gramatica...")
+        self.tareas.enviar(
+            "diagrama_gramatica",
+            renderizar,
+            mostrar,
+            al_fallar=self._fallo("No se pudo generar el diagrama"),
+        )
 
     def generar_pdf_gramatica(self):
         if self.resultado_gram is None:
@@ -161,22 +375,35 @@ class App:
         if not ruta_pdf:
             return
 
-        try:
-            producciones = parsear_gramatica_simple(texto)
-            with tempfile.TemporaryDirectory() as tmpdir:
-                ruta_base = os.path.join(tmpdir, "gramatica_diagrama")
-                ruta_img = dibujar_gramatica(producciones, ruta_base)
-                generar_reporte_pdf(
-                    ruta_pdf,
-                    "Reporte de gramatica",
-                    texto,
-                    True,
-                    self.resultado_gram,
-                    [ruta_img],
-                )
+        producciones = parsear_gramatica_simple(texto)
+        resultado = self.resultado_gram
+
+        def generar(progreso):
+            from visualizador import imagen_gramatica
+            from reportes import generar_reporte_pdf
+
+            imagen = imagen_gramatica(producciones)
+            progreso(1)
+            generar_reporte_pdf(
+                ruta_pdf,
+                "Reporte de gramatica",
+                texto,
+                True,
+                resultado,
+                [imagen],
+            )
+
+        def terminado(_):
+            self.estado("")
             messagebox.showinfo("Reporte", "Reporte PDF generado correctamente.")
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo generar el reporte:\n{e}")
+
+        self.estado("Generando reporte PDF de la gramatica...")
+        self.tareas.enviar(
+            "pdf_gramatica",
+            generar,
+            terminado,
+            al_fallar=self._fallo("No se pudo generar el reporte"),
+        )
 
     def crear_tab_automata(self, frame):
         frame.columnconfigure(0, weight=1)
@@ -207,6 +434,11 @@ class App:
         )
         btn_pdf.grid(row=0, column=2, padx=2)
 
+        btn_min = ttk.Button(
+            cont_botones, text="Minimizar AFD", command=self.minimizar_automata_ui
+        )
+        btn_min.grid(row=0, column=3, padx=2)
+
         self.lbl_tipo_auto = ttk.Label(frame, text="Tipo: ")
         self.lbl_tipo_auto.grid(row=3, column=0, sticky="w", padx=5, pady=5)
 
@@ -223,15 +455,38 @@ class App:
             return
         try:
             automata = cargar_automata_desde_json(texto)
-            resultado = clasificar_automata(automata)
+            resultado = clasificar_automata_cacheada(automata)
             self.resultado_auto = resultado
             self.lbl_tipo_auto.config(text="Tipo: " + resultado.etiqueta)
             self.txt_exp_auto.delete("1.0", "end")
             for linea in resultado.explicacion:
                 self.txt_exp_auto.insert("end", linea + "\n")
+            self._prerenderizar("imagen_automata", automata)
         except Exception as e:
             messagebox.showerror("Error", f"Error al analizar el automata:\n{e}")
 
+    def minimizar_automata_ui(self):
+        texto = self.txt_auto.get("1.0", "end").strip()
+        if not texto:
+            messagebox.showwarning("Aviso", "Ingresa un automata en JSON.")
+            return
+        try:
+            automata = cargar_automata_desde_json(texto)
+            motivo = motivo_no_minimizable(automata)
+            if motivo is not None:
+                messagebox.showwarning("Aviso", "Solo se pueden minimizar AFD.\n" + motivo)
+                return
+            minimo = minimizar_automata(automata)
+            self.txt_auto.delete("1.0", "end")
+            self.txt_auto.insert("1.0", automata_a_json(minimo))
+            self.resultado_auto = None
+            messagebox.showinfo(
+                "Minimizacion",
+                f"Estados: {len(automata.estados)} -> {len(minimo.estados)}",
+            )
+        except Exception as e:
+            messagebox.showerror("Error", f"No se pudo minimizar el automata:\n{e}")
+
     def ver_diagrama_automata(self):
         texto = self.txt_auto.get("1.0", "end").strip()
         if not texto:
@@ -239,17 +494,26 @@ class App:
             return
         try:
             automata = cargar_automata_desde_json(texto)
-            with tempfile.TemporaryDirectory() as tmpdir:
-                ruta_base = os.path.join(tmpdir, "automata_diagrama")
-                ruta_img = dibujar_automata(automata, ruta_base)
-                top = tk.Toplevel(self.root)
-                top.title("Diagrama de automata")
-                img = tk.PhotoImage(file=ruta_img)
-                self.imagen_auto = img
-                lbl_img = tk.Label(top, image=img)
-                lbl_img.pack(padx=10, pady=10)
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo generar el diagrama:\n{e}")
+            return
+
+        def renderizar(progreso):
+            from visualizador import imagen_automata
+
+            return _png_base64(imagen_automata(automata))
+
+        def mostrar(datos_png):
+            self.estado("")
+            self.imagen_auto = self._mostrar_imagen("Diagrama de automata", datos_png)
+
+        self.estado(f"Generando diagrama del automata ({len(automata.estados)} estados)...")
+        self.tareas.enviar(
+            "diagrama_automata",
+            renderizar,
+            mostrar,
+            al_fallar=self._fallo("No se pudo generar el diagrama"),
+        )
 
     def generar_pdf_automata(self):
         if self.resultado_auto is None:
@@ -270,20 +534,37 @@ class App:
 
         try:
             automata = cargar_automata_desde_json(texto)
-            with tempfile.TemporaryDirectory() as tmpdir:
-                ruta_base = os.path.join(tmpdir, "automata_diagrama")
-                ruta_img = dibujar_automata(automata, ruta_base)
-                generar_reporte_pdf(
-                    ruta_pdf,
-                    "Reporte de automata",
-                    texto,
-                    False,
-                    self.resultado_auto,
-                    [ruta_img],
-                )
-            messagebox.showinfo("Reporte", "Reporte PDF generado correctamente.")
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo generar el reporte:\n{e}")
+            return
+        resultado = self.resultado_auto
+
+        def generar(progreso):
+            from visualizador import imagen_automata
+            from reportes import generar_reporte_pdf
+
+            imagen = imagen_automata(automata)
+            progreso(1)
+            generar_reporte_pdf(
+                ruta_pdf,
+                "Reporte de automata",
+                texto,
+                False,
+                resultado,
+                [imagen],
+            )
+
+        def terminado(_):
+            self.estado("")
+            messagebox.showinfo("Reporte", "Reporte PDF generado correctamente.")
+
+        self.estado("Generando reporte PDF del automata...")
+        self.tareas.enviar(
+            "pdf_automata",
+            generar,
+            terminado,
+            al_fallar=self._fallo("No se pudo generar el reporte"),
+        )
 
     def crear_tab_comparar(self, frame):
         frame.columnconfigure(0, weight=1)
@@ -304,13 +585,21 @@ class App:
 
         lbl_long = ttk.Label(frame, text="Longitud maxima de cadenas a comparar:")
         lbl_long.grid(row=2, column=0, sticky="w", padx=5, pady=5)
-        self.spin_long = tk.Spinbox(frame, from_=1, to=8)
+        self.spin_long = tk.Spinbox(frame, from_=1, to=14)
         self.spin_long.grid(row=2, column=1, sticky="w", padx=5, pady=5)
         self.spin_long.delete(0, "end")
         self.spin_long.insert(0, "4")
 
-        btn = ttk.Button(frame, text="Comparar", command=self.comparar_gramaticas_ui)
-        btn.grid(row=3, column=0, sticky="w", padx=5, pady=5)
+        cont_botones = ttk.Frame(frame)
+        cont_botones.grid(row=3, column=0, sticky="w", padx=5, pady=5)
+
+        btn = ttk.Button(cont_botones, text="Comparar", command=self.comparar_gramaticas_ui)
+        btn.grid(row=0, column=0, padx=2)
+
+        btn_cancelar = ttk.Button(
+            cont_botones, text="Cancelar", command=self.cancelar_comparacion_ui
+        )
+        btn_cancelar.grid(row=0, column=1, padx=2)
 
         self.txt_comp_res = tk.Text(frame, height=8)
         self.txt_comp_res.grid(
@@ -328,12 +617,32 @@ class App:
         if not g1 or not g2:
             messagebox.showwarning("Aviso", "Ingresa ambas gramaticas.")
             return
-        try:
-            mensaje = comparar_gramaticas_texto(g1, g2, max_longitud=max_long)
+
+        def comparar(progreso):
+            return comparar_gramaticas_cacheada(
+                g1, g2, max_longitud=max_long, al_progresar=progreso
+            )
+
+        def mostrar(mensaje):
+            self.estado("")
             self.txt_comp_res.delete("1.0", "end")
             self.txt_comp_res.insert("end", mensaje)
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al comparar gramaticas:\n{e}")
+
+        def avance(generadas):
+            self.estado(f"Comparando gramaticas... {generadas} cadenas generadas")
+
+        self.estado("Comparando gramaticas...")
+        self.tareas.enviar(
+            "comparar",
+            comparar,
+            mostrar,
+            al_progresar=avance,
+            al_fallar=self._fallo("Error al comparar gramaticas"),
+        )
+
+    def cancelar_comparacion_ui(self):
+        if self.tareas.cancelar("comparar"):
+            self.estado("Comparacion cancelada.")
 
     def crear_tab_generador(self, frame):
         frame.columnconfigure(0, weight=1)
@@ -444,8 +753,65 @@ class App:
         else:
             messagebox.showerror("Resultado", mensaje)
 
+    def crear_tab_metricas(self, frame):
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(1, weight=1)
+
+        barra = ttk.Frame(frame)
+        barra.grid(row=0, column=0, sticky="w", padx=5, pady=5)
+
+        self.var_instrumentar = tk.BooleanVar(value=instrumentacion.ACTIVA)
+        chk = ttk.Checkbutton(
+            barra, text="Medir contadores y tiempos", variable=self.var_instrumentar, command=self.alternar_metricas
+        )
+        chk.pack(side="left", padx=5)
+        btn_reiniciar = ttk.Button(barra, text="Reiniciar", command=self.reiniciar_metricas)
+        btn_reiniciar.pack(side="left", padx=5)
+        btn_guardar = ttk.Button(barra, text="Guardar JSON", command=self.guardar_metricas)
+        btn_guardar.pack(side="left", padx=5)
+
+        self.txt_metricas = tk.Text(frame, height=15, state="disabled")
+        self.txt_metricas.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        self.actualizar_metricas()
+
+    def alternar_metricas(self):
+        if self.var_instrumentar.get():
+            instrumentacion.activar()
+        else:
+            instrumentacion.desactivar()
+
+    def reiniciar_metricas(self):
+        instrumentacion.reiniciar()
+        self._pintar_metricas()
+
+    def guardar_metricas(self):
+        ruta = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json")],
+            title="Guardar metricas",
+        )
+        if not ruta:
+            return
+        instrumentacion.volcar_json(ruta)
+        self.estado(f"Metricas guardadas en {ruta}")
+
+    def _pintar_metricas(self):
+        texto = instrumentacion.formatear()
+        if not texto:
+            texto = "Sin datos." if instrumentacion.ACTIVA else "La medicion esta desactivada."
+        self.txt_metricas.config(state="normal")
+        self.txt_metricas.delete("1.0", "end")
+        self.txt_metricas.insert("end", texto)
+        self.txt_metricas.config(state="disabled")
+
+    def actualizar_metricas(self):
+        if instrumentacion.ACTIVA or not self.txt_metricas.get("1.0", "end").strip():
+            self._pintar_metricas()
+        self.root.after(INTERVALO_METRICAS_MS, self.actualizar_metricas)
+
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = App(root)
     root.mainloop()
+    app.tareas.cerrar()
@@ -1,17 +1,159 @@
+import hashlib
+import io
+import multiprocessing
 import os
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Union
 
 from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader, simpleSplit
 from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
 
+MARGEN = 50
+MARGEN_INFERIOR = 60
+ALTO_MAXIMO_IMAGEN = 300
 
-def _escribir_lineas(canvas_obj, lineas, x, y_inicio, salto):
-    texto = canvas_obj.beginText(x, y_inicio)
+Imagen = Union[str, bytes]
+
+
+@dataclass
+class ItemReporte:
+    titulo: str
+    texto_entrada: str
+    es_gramatica: bool
+    resultado: object = None
+    imagenes: List[Imagen] = field(default_factory=list)
+
+
+@dataclass
+class SeccionReporte:
+    titulo: str
+    encabezado: str
+    lineas_entrada: List[str]
+    etiqueta: str
+    lineas_explicacion: List[str]
+    imagenes: List[Imagen]
+
+
+def _ajustar(lineas: Iterable[str], fuente: str, tam: float, ancho: float) -> List[str]:
+    ajustadas: List[str] = []
     for linea in lineas:
-        texto.textLine(linea)
-    canvas_obj.drawText(texto)
-    return texto.getY()
+        ajustadas.extend(simpleSplit(str(linea), fuente, tam, ancho) or [""])
+    return ajustadas
+
+
+def preparar_seccion(item: ItemReporte, ancho: float = letter[0]) -> SeccionReporte:
+    resultado = item.resultado
+    if resultado is None:
+        if item.es_gramatica:
+            from cache_clasificacion import clasificar_gramatica_cacheada
+
+            resultado = clasificar_gramatica_cacheada(item.texto_entrada)
+        else:
+            from automatas import cargar_automata_desde_json
+            from cache_clasificacion import clasificar_automata_cacheada
+
+            resultado = clasificar_automata_cacheada(cargar_automata_desde_json(item.texto_entrada))
+    ancho_texto = ancho - 2 * MARGEN - 10
+    return SeccionReporte(
+        titulo=item.titulo,
+        encabezado="Gramatica analizada:" if item.es_gramatica else "Automata analizado (texto):",
+        lineas_entrada=_ajustar(item.texto_entrada.splitlines(), "Helvetica", 11, ancho_texto),
+        etiqueta=str(resultado.etiqueta),
+        lineas_explicacion=_ajustar(resultado.explicacion, "Helvetica", 11, ancho_texto),
+        imagenes=list(item.imagenes),
+    )
+
+
+class _EscritorPaginado:
+    def __init__(self, c: canvas.Canvas, ancho: float, alto: float):
+        self.c = c
+        self.ancho = ancho
+        self.alto = alto
+        self.y = alto - MARGEN
+        self._formas = {}
+
+    def nueva_pagina(self) -> None:
+        self.c.showPage()
+        self.y = self.alto - MARGEN
+
+    def reservar(self, alto: float) -> None:
+        if self.y - alto < MARGEN_INFERIOR:
+            self.nueva_pagina()
+
+    def linea(self, texto: str, x: float = MARGEN, fuente: str = "Helvetica", tam: float = 11, salto: float = 15) -> None:
+        self.reservar(salto)
+        self.c.setFont(fuente, tam)
+        self.c.drawString(x, self.y, texto)
+        self.y -= salto
+
+    def lineas(self, lineas: List[str], x: float = MARGEN + 10, salto: float = 14) -> None:
+        pos = 0
+        while pos < len(lineas):
+            caben = max(1, int((self.y - MARGEN_INFERIOR) // salto))
+            bloque = lineas[pos:pos + caben]
+            texto = self.c.beginText(x, self.y)
+            texto.setFont("Helvetica", 11)
+            texto.setLeading(salto)
+            for linea in bloque:
+                texto.textLine(linea)
+            self.c.drawText(texto)
+            self.y -= salto * len(bloque)
+            pos += len(bloque)
+            if pos < len(lineas):
+                self.nueva_pagina()
+
+    def _forma(self, imagen: Imagen):
+        if isinstance(imagen, bytes):
+            clave = hashlib.sha256(imagen).hexdigest()
+        else:
+            clave = os.path.abspath(imagen)
+        forma = self._formas.get(clave)
+        if forma is None:
+            lector = ImageReader(io.BytesIO(imagen) if isinstance(imagen, bytes) else imagen)
+            iw, ih = lector.getSize()
+            nombre = f"img{len(self._formas)}"
+            self.c.beginForm(nombre, lowerx=0, lowery=0, upperx=iw, uppery=ih)
+            self.c.drawImage(lector, 0, 0, width=iw, height=ih)
+            self.c.endForm()
+            forma = (nombre, iw, ih)
+            self._formas[clave] = forma
+        return forma
+
+    def imagen(self, imagen: Imagen) -> None:
+        if isinstance(imagen, str) and not os.path.exists(imagen):
+            return
+        try:
+            nombre, iw, ih = self._forma(imagen)
+        except Exception:
+            return
+        escala = min((self.ancho - 2 * MARGEN) / iw, ALTO_MAXIMO_IMAGEN / ih)
+        h = ih * escala
+        if self.y - h < MARGEN_INFERIOR + 20:
+            self.nueva_pagina()
+            self.y -= 30
+        self.c.saveState()
+        self.c.translate(MARGEN, self.y - h)
+        self.c.scale(escala, escala)
+        self.c.doForm(nombre)
+        self.c.restoreState()
+        self.y -= h + 20
+
+    def seccion(self, seccion: SeccionReporte, con_fecha: bool = False) -> None:
+        self.reservar(80)
+        self.linea(seccion.titulo, fuente="Helvetica-Bold", tam=16, salto=20)
+        if con_fecha:
+            self.linea("Fecha: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"), tam=10, salto=20)
+        self.linea("Tipo detectado: " + seccion.etiqueta, fuente="Helvetica-Bold", tam=12, salto=30)
+        self.linea(seccion.encabezado)
+        self.lineas(seccion.lineas_entrada)
+        self.y -= 20
+        self.linea("Explicacion:", fuente="Helvetica-Bold", tam=12)
+        self.lineas(seccion.lineas_explicacion)
+        self.y -= 20
+        for imagen in seccion.imagenes:
+            self.imagen(imagen)
 
 
 def generar_reporte_pdf(
@@ -24,55 +166,42 @@ def generar_reporte_pdf(
 ):
     c = canvas.Canvas(ruta_pdf, pagesize=letter)
     ancho, alto = letter
-
     c.setTitle(titulo)
+    escritor = _EscritorPaginado(c, ancho, alto)
+    item = ItemReporte(titulo, texto_entrada, es_gramatica, resultado, list(rutas_imagenes))
+    escritor.seccion(preparar_seccion(item, ancho), con_fecha=True)
+    c.showPage()
+    c.save()
+
+
+def _secciones(items: Iterable[ItemReporte], procesos: int, tam_bloque: int) -> Iterator[SeccionReporte]:
+    if procesos <= 1:
+        for item in items:
+            yield preparar_seccion(item)
+        return
+    with multiprocessing.Pool(procesos) as pool:
+        yield from pool.imap(preparar_seccion, items, chunksize=tam_bloque)
 
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, alto - 50, titulo)
-
-    c.setFont("Helvetica", 10)
-    fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    c.drawString(50, alto - 70, "Fecha: " + fecha)
-
-    c.setFont("Helvetica-Bold", 12)
-    etiqueta_tipo = "Tipo detectado: " + str(resultado.etiqueta)
-    c.drawString(50, alto - 90, etiqueta_tipo)
-
-    c.setFont("Helvetica", 11)
-    y = alto - 120
-    encabezado = "Gramatica analizada:" if es_gramatica else "Automata analizado (texto):"
-    c.drawString(50, y, encabezado)
-    y -= 15
-
-    lineas_entrada = texto_entrada.splitlines()
-    y = _escribir_lineas(c, lineas_entrada, 60, y, 14)
-    y -= 20
-
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "Explicacion:")
-    y -= 15
-    c.setFont("Helvetica", 11)
-    y = _escribir_lineas(c, resultado.explicacion, 60, y, 14)
-    y -= 20
-
-    for ruta_img in rutas_imagenes:
-        if not os.path.exists(ruta_img):
-            continue
-        try:
-            img = ImageReader(ruta_img)
-            iw, ih = img.getSize()
-            escala = min((ancho - 100) / iw, 300 / ih)
-            w = iw * escala
-            h = ih * escala
-
-            if y - h < 80:
-                c.showPage()
-                y = alto - 80
-
-            c.drawImage(img, 50, y - h, width=w, height=h)
-            y -= h + 20
-        except Exception:
-            continue
 
+def generar_reporte_lote(
+    ruta_pdf: str,
+    titulo: str,
+    items: Iterable[ItemReporte],
+    procesos: int = 1,
+    tam_bloque: int = 16,
+) -> int:
+    c = canvas.Canvas(ruta_pdf, pagesize=letter)
+    ancho, alto = letter
+    c.setTitle(titulo)
+    escritor = _EscritorPaginado(c, ancho, alto)
+    escritor.linea(titulo, fuente="Helvetica-Bold", tam=18, salto=22)
+    escritor.linea("Fecha: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"), tam=10, salto=30)
+    total = 0
+    for seccion in _secciones(items, procesos or os.cpu_count() or 1, tam_bloque):
+        if total:
+            escritor.y -= 10
+        escritor.seccion(seccion)
+        total += 1
     c.showPage()
     c.save()
+    return total
@@ -0,0 +1,123 @@
+import io
+import json
+
+import pytest
+
+from automatas import (
+    Automata,
+    IndiceTransiciones,
+    SimuladorAF,
+    SimuladorAP,
+    SimuladorMT,
+    cargar_automata_desde_json,
+    clasificar_automata,
+    minimizar_automata,
+)
+from ejemplos import obtener_ejemplo_automata
+
+
+def test_acepta_flujo_con_simbolos_multibyte_partidos():
+    simulador = SimuladorAF({
+        "estados": ["q"],
+        "alfabeto": ["é"],
+        "estado_inicial": "q",
+        "estados_finales": ["q"],
+        "transiciones": [{"origen": "q", "simbolo": "é", "destino": "q"}],
+    })
+    assert simulador.acepta_flujo(io.BytesIO(("é" * 10).encode("utf-8")), tam_bloque=3)
+
+
+def test_clasificacion_ve_cambios_en_las_transiciones():
+    automata = cargar_automata_desde_json(obtener_ejemplo_automata(3))
+    assert clasificar_automata(automata).tipo == 3
+    automata.transiciones[0] = {"origen": "q0", "simbolo": "a", "desapila": "", "apila": "A", "destino": "q1"}
+    assert clasificar_automata(automata).tipo == 2
+
+
+def test_indice_explicito_compartido():
+    indice = IndiceTransiciones(cargar_automata_desde_json(obtener_ejemplo_automata(3)))
+    assert clasificar_automata(indice).tipo == 3
+    assert SimuladorAF(indice).acepta("abb")
+
+
+def test_minimizar_rechaza_epsilon_aunque_se_declare_afd():
+    automata = Automata(
+        tipo="AFD",
+        estados=["q0", "q1"],
+        alfabeto=["a"],
+        transiciones=[
+            {"origen": "q0", "simbolo": "", "destino": "q1"},
+            {"origen": "q1", "simbolo": "a", "destino": "q1"},
+        ],
+        estado_inicial="q0",
+        estados_finales=["q1"],
+    )
+    assert SimuladorAF(automata).acepta("a")
+    with pytest.raises(ValueError):
+        minimizar_automata(automata)
+
+
+def test_minimizar_usa_la_estructura_y_conserva_campos():
+    automata = Automata(
+        tipo="Automata finito",
+        estados=["q0", "q1", "q2"],
+        alfabeto=["a"],
+        transiciones=[
+            {"origen": "q0", "simbolo": "a", "destino": "q1"},
+            {"origen": "q1", "simbolo": "a", "destino": "q2"},
+            {"origen": "q2", "simbolo": "a", "destino": "q2"},
+        ],
+        estado_inicial="q0",
+        estados_finales=["q1", "q2"],
+        simbolo_blanco="#",
+    )
+    minimo = minimizar_automata(automata)
+    assert len(minimo.estados) == 2
+    assert minimo.simbolo_blanco == "#"
+    original = SimuladorAF(automata)
+    reducido = SimuladorAF(minimo)
+    for n in range(5):
+        assert original.acepta("a" * n) == reducido.acepta("a" * n)
+
+
+def test_mt_simbolos_ajenos_no_amplian_el_simulador():
+    datos = json.loads(obtener_ejemplo_automata(0))
+    simulador = SimuladorMT(datos)
+    total = len(simulador.simbolos)
+    for i in range(300):
+        resultado = simulador.ejecutar(chr(1000 + i) + "ab")
+        assert not resultado.aceptada
+    assert len(simulador.simbolos) == total
+    assert simulador.ejecutar("aabb").aceptada
+
+
+def test_mt_mueve_nulo_usa_derecha():
+    datos = json.loads(obtener_ejemplo_automata(0))
+    for t in datos["transiciones"]:
+        if t.get("mueve") == "R":
+            t["mueve"] = None
+    assert SimuladorMT(datos).ejecutar("aabb").aceptada
+
+
+def test_ap_reconoce_anbn_y_respeta_el_limite():
+    datos = json.loads(obtener_ejemplo_automata(2))
+    simulador = SimuladorAP(datos)
+    aceptadas = [w for w in ("", "ab", "aabb", "aaabbb", "aab", "abab", "ba") if simulador.acepta(w)]
+    assert aceptadas == ["ab", "aabb", "aaabbb"]
+    assert SimuladorAP(datos, max_configuraciones=3).ejecutar("aaaabbbb").motivo == "limite"
+
+
+def test_mt_limites_de_pasos_y_bucles():
+    datos = json.loads(obtener_ejemplo_automata(0))
+    simulador = SimuladorMT(datos)
+    assert simulador.ejecutar("aaabbb").cinta == "XXXYYY"
+    assert simulador.ejecutar("aaabbb", max_pasos=3).motivo == "limite_pasos"
+    bucle = {
+        "estados": ["q"],
+        "alfabeto": ["a"],
+        "estado_inicial": "q",
+        "estados_finales": [],
+        "transiciones": [{"origen": "q", "simbolo": "_", "escribe": "_", "mueve": "S", "destino": "q"}],
+    }
+    assert SimuladorMT(bucle).ejecutar("").motivo == "bucle"
+    assert SimuladorMT(bucle, detectar_bucles=False).ejecutar("", max_pasos=100).motivo == "limite_pasos"
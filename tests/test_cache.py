@@ -0,0 +1,51 @@
+import pytest
+
+import cache_clasificacion
+from automatas import cargar_automata_desde_json
+from cache_clasificacion import CacheClasificacion
+from ejemplos import obtener_ejemplo_automata
+
+
+@pytest.fixture
+def cache():
+    yield cache_clasificacion.configurar_cache(max_entradas=2)
+    cache_clasificacion.configurar_cache()
+
+
+def test_cache_desaloja_la_entrada_menos_usada():
+    c = CacheClasificacion(max_entradas=2)
+    c.guardar("a", 1)
+    c.guardar("b", 2)
+    assert c.obtener("a") == 1
+    c.guardar("c", 3)
+    assert c.obtener("b") is None
+    assert c.obtener("a") == 1
+    estadisticas = c.estadisticas()
+    assert estadisticas["desalojos"] == 1
+    assert estadisticas["fallos"] == 1
+
+
+def test_cache_en_disco_sobrevive_a_la_memoria(tmp_path):
+    ruta = str(tmp_path / "cache.sqlite")
+    c = CacheClasificacion(ruta_disco=ruta)
+    c.guardar("clave", {"tipo": 3})
+    c.cerrar()
+    c = CacheClasificacion(ruta_disco=ruta)
+    assert c.obtener("clave") == {"tipo": 3}
+    assert c.aciertos_disco == 1
+    c.cerrar()
+
+
+def test_gramaticas_equivalentes_comparten_entrada(cache):
+    primero = cache_clasificacion.clasificar_gramatica_cacheada("S -> aS | b")
+    segundo = cache_clasificacion.clasificar_gramatica_cacheada("S->aS|b\n\n")
+    assert segundo == primero
+    assert cache.estadisticas()["aciertos_memoria"] >= 1
+
+
+def test_automata_cacheado_coincide_con_el_calculado(cache):
+    automata = cargar_automata_desde_json(obtener_ejemplo_automata(2))
+    primero = cache_clasificacion.clasificar_automata_cacheada(automata)
+    segundo = cache_clasificacion.clasificar_automata_cacheada(automata)
+    assert primero.tipo == 2
+    assert segundo == primero
@@ -0,0 +1,79 @@
+import io
+import json
+import pickle
+
+import cache_clasificacion
+from analizador_gramatica import parsear_gramatica
+from clasificador import (
+    AnalizadorIncremental,
+    ClasificadorPorLineas,
+    analizar_gramatica,
+    clasificar_gramatica_archivo,
+    clasificar_gramatica_texto,
+)
+
+
+def test_explicacion_es_una_lista():
+    resultado = clasificar_gramatica_texto("S -> aSb | ab")
+    assert isinstance(resultado.explicacion, list)
+    resultado.explicacion.append("extra")
+    resultado.explicacion[0:1] = ["inicio"]
+    assert json.loads(json.dumps(resultado.explicacion))[0] == "inicio"
+    assert resultado.explicacion[-1] == "extra"
+
+
+def test_resultado_se_puede_serializar():
+    resultado = clasificar_gramatica_texto("S -> aA\nA -> b")
+    copia = pickle.loads(pickle.dumps(resultado))
+    assert copia == resultado
+    assert copia.explicacion == resultado.explicacion
+
+
+def test_cache_en_disco_devuelve_el_mismo_tipo(tmp_path):
+    texto = "S -> aB\nB -> b"
+    ruta = str(tmp_path / "cache.sqlite")
+    try:
+        cache_clasificacion.configurar_cache(ruta_disco=ruta)
+        fresco = cache_clasificacion.clasificar_gramatica_cacheada(texto)
+        cache_clasificacion.configurar_cache(ruta_disco=ruta)
+        desde_disco = cache_clasificacion.clasificar_gramatica_cacheada(texto)
+    finally:
+        cache_clasificacion.configurar_cache()
+    assert type(desde_disco) is type(fresco)
+    assert isinstance(desde_disco.explicacion, list)
+    assert desde_disco == fresco
+
+
+TEXTOS = (
+    "S -> aA\nA -> b",
+    "S -> aSb | ab",
+    "S -> aSBc | abc\ncB -> Bc\nbB -> bb",
+    "S -> aA\nAB -> b",
+    "S -> ABC\nAB1 -> a",
+)
+
+
+def test_analizador_incremental_coincide_con_el_completo():
+    for texto in TEXTOS:
+        producciones = parsear_gramatica(texto)
+        incremental = AnalizadorIncremental()
+        for p in producciones:
+            incremental.agregar(p)
+        assert incremental.resultado().tipo == analizar_gramatica(producciones).tipo, texto
+        resultado, errores = clasificar_gramatica_archivo(io.StringIO(texto + "\n-> mal"))
+        assert resultado == clasificar_gramatica_texto(texto)
+        assert len(errores) == 1
+
+
+def test_clasificador_por_lineas_solo_recalcula_lineas_nuevas():
+    clasificador = ClasificadorPorLineas()
+    texto = "S -> aA\nA -> bA | b"
+    analisis, _ = clasificador.analizar(texto)
+    assert analisis.tipo == 3
+    recalculadas = clasificador.lineas_recalculadas
+    analisis, _ = clasificador.analizar(texto + "\nA -> SS")
+    assert analisis.tipo == 2
+    assert clasificador.lineas_recalculadas == recalculadas + 1
+    for texto in TEXTOS:
+        analisis, _ = clasificador.analizar(texto)
+        assert analisis.tipo == analizar_gramatica(parsear_gramatica(texto)).tipo, texto
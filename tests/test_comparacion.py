@@ -0,0 +1,33 @@
+from clasificador import comparar_gramaticas_texto, generar_cadenas
+from analizador_gramatica import parsear_gramatica
+from conversor import afd_acepta, gramatica_regular_a_afd
+
+
+def test_afd_usa_primer_lado_izquierdo_como_inicial():
+    afd = gramatica_regular_a_afd(parsear_gramatica("A -> aA | b"))
+    assert afd_acepta(afd, "aab")
+    assert not afd_acepta(afd, "aa")
+
+
+def test_comparar_regulares_con_inicial_distinto_de_s():
+    resultado = comparar_gramaticas_texto("A -> aA | a", "A -> b")
+    assert "NO generan el mismo lenguaje" in resultado
+    assert "Equivalencia exacta" in comparar_gramaticas_texto("A -> aA | a", "B -> aB | a")
+
+
+def test_comparar_libres_de_contexto_con_inicial_distinto_de_s():
+    resultado = comparar_gramaticas_texto("A -> aAb | ab", "A -> aAb | b")
+    assert "no coinciden" in resultado
+    assert generar_cadenas(parsear_gramatica("A -> aAb | ab"), max_longitud=4) == {"ab", "aabb"}
+
+
+def test_inicial_sin_producciones_no_es_equivalencia():
+    resultado = comparar_gramaticas_texto("S -> a", "S -> a", simbolo_inicial1="X")
+    assert "Equivalencia" not in resultado
+    assert "no tiene producciones" in resultado
+
+
+def test_modos_de_generacion_coinciden_con_no_terminales_largos():
+    for texto in ("Expr -> Expr+Term | Term\nTerm -> a | (Expr)", "S -> A1b | c\nA1 -> aA1 | a"):
+        producciones = parsear_gramatica(texto)
+        assert generar_cadenas(producciones, 6, modo="bfs") == generar_cadenas(producciones, 6, modo="tablas")
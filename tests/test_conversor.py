@@ -0,0 +1,98 @@
+import itertools
+import random
+
+import pytest
+
+from conversor import (
+    afd_acepta,
+    compilar_afd,
+    minimizar_afd,
+    regex_a_afd,
+    regex_a_afd_perezoso,
+)
+
+REGEX = ("(a|b)*abb", "a*b*", "(ab|ba)*", "(a|b)*a(a|b)(a|b)", "a*|a*b")
+
+
+def _cadenas(alfabeto, max_longitud):
+    for n in range(max_longitud + 1):
+        yield from map("".join, itertools.product(alfabeto, repeat=n))
+
+
+@pytest.mark.parametrize("regex", REGEX)
+def test_minimizar_conserva_el_lenguaje(regex):
+    original = regex_a_afd(regex, minimizar=False)
+    minimo = minimizar_afd(original)
+    assert len(minimo["estados"]) <= len(original["estados"])
+    for w in _cadenas("ab", 7):
+        assert afd_acepta(minimo, w) == afd_acepta(original, w), w
+    assert len(minimizar_afd(minimo)["estados"]) == len(minimo["estados"])
+
+
+def test_minimizar_afd_aleatorios():
+    azar = random.Random(7)
+    for _ in range(100):
+        estados = [f"s{i}" for i in range(azar.randint(1, 8))]
+        automata = {
+            "alfabeto": ["a", "b"],
+            "estado_inicial": estados[0],
+            "estados_finales": [e for e in estados if azar.random() < 0.4],
+            "transiciones": [
+                {"origen": e, "simbolo": c, "destino": azar.choice(estados)}
+                for e in estados
+                for c in "ab"
+                if azar.random() < 0.85
+            ],
+        }
+        minimo = minimizar_afd(automata)
+        for w in _cadenas("ab", 6):
+            assert afd_acepta(minimo, w) == afd_acepta(automata, w)
+
+
+def test_minimizar_une_estados_equivalentes():
+    automata = {
+        "alfabeto": ["a"],
+        "estado_inicial": "p",
+        "estados_finales": ["q", "r"],
+        "transiciones": [
+            {"origen": "p", "simbolo": "a", "destino": "q"},
+            {"origen": "q", "simbolo": "a", "destino": "r"},
+            {"origen": "r", "simbolo": "a", "destino": "r"},
+        ],
+    }
+    assert len(minimizar_afd(automata)["estados"]) == 2
+
+
+@pytest.mark.parametrize("regex", REGEX)
+def test_afd_perezoso_coincide_con_el_completo(regex):
+    completo = regex_a_afd(regex)
+    perezoso = regex_a_afd_perezoso(regex, max_estados=2)
+    for w in _cadenas("ab", 7):
+        assert perezoso.acepta(w) == afd_acepta(completo, w), w
+    estadisticas = perezoso.estadisticas()
+    assert estadisticas["estados_en_cache"] <= 2
+    assert not perezoso.acepta("c")
+
+
+def test_afd_perezoso_rechaza_limite_invalido():
+    with pytest.raises(ValueError):
+        regex_a_afd_perezoso("a", max_estados=0)
+
+
+@pytest.mark.parametrize("regex", REGEX)
+def test_afd_compilado_coincide_con_el_diccionario(regex):
+    afd = regex_a_afd(regex)
+    compilado = compilar_afd(afd)
+    cadenas = list(_cadenas("ab", 6))
+    esperado = [afd_acepta(afd, w) for w in cadenas]
+    assert [compilado.acepta(w) for w in cadenas] == esperado
+    assert list(map(bool, compilado.acepta_varios(cadenas))) == esperado
+    misma = [w for w in cadenas if len(w) == 5]
+    resultado = compilado.acepta_misma_longitud(misma)
+    assert isinstance(resultado, bytearray)
+    assert list(map(bool, resultado)) == [afd_acepta(afd, w) for w in misma]
+
+
+def test_afd_compilado_rechaza_longitudes_distintas():
+    with pytest.raises(ValueError):
+        compilar_afd(regex_a_afd("a*")).acepta_misma_longitud(["a", "aa"])
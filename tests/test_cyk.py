@@ -0,0 +1,25 @@
+import itertools
+
+from analizador_earley import ParserEarley
+from analizador_gramatica import parsear_gramatica
+from clasificador import compilar_cyk, convertir_a_fnc
+
+
+def test_cyk_usa_primer_lado_izquierdo_como_inicial():
+    cyk = compilar_cyk(parsear_gramatica("A -> aA | b"))
+    assert cyk.acepta("ab")
+    assert not cyk.acepta("a")
+
+
+def test_fnc_no_repite_no_terminales():
+    fnc = convertir_a_fnc(parsear_gramatica("S -> aSb | ab"))
+    assert len(fnc.no_terminales) == len(set(fnc.no_terminales))
+
+
+def test_fnc_no_choca_con_nombres_del_usuario():
+    gramatica = parsear_gramatica("S -> aSbS | T_a\nT_a -> c\nS_0_1 -> a")
+    cyk = compilar_cyk(gramatica)
+    earley = ParserEarley(gramatica)
+    for n in range(6):
+        for w in map("".join, itertools.product("abc", repeat=n)):
+            assert cyk.acepta(w) == earley.reconocer(w), w
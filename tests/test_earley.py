@@ -0,0 +1,39 @@
+import itertools
+
+import pytest
+
+from analizador_earley import ParserEarley
+from analizador_gramatica import parsear_gramatica
+from clasificador import generar_cadenas
+
+GRAMATICAS = (
+    ("S -> SS | aSb | ab", "ab"),
+    ("S -> aSb | epsilon", "ab"),
+    ("Expr -> Expr+Term | Term\nTerm -> a | (Expr)", "a+()"),
+    ("S -> AB\nA -> aA | epsilon\nB -> bB | b", "ab"),
+)
+
+
+def _cadenas(alfabeto, max_longitud):
+    for n in range(max_longitud + 1):
+        yield from map("".join, itertools.product(alfabeto, repeat=n))
+
+
+@pytest.mark.parametrize("texto, alfabeto", GRAMATICAS)
+def test_earley_reconoce_lo_que_genera_la_gramatica(texto, alfabeto):
+    producciones = parsear_gramatica(texto)
+    parser = ParserEarley(producciones)
+    generadas = generar_cadenas(producciones, max_longitud=5)
+    for w in _cadenas(alfabeto, 5):
+        assert parser.reconocer(w) == (w in generadas), w
+
+
+def test_earley_devuelve_arbol_para_cadenas_aceptadas():
+    parser = ParserEarley(parsear_gramatica("S -> SS | aSb | ab"))
+    assert parser.analizar("abab").arbol() == ("S", [("S", ["a", "b"]), ("S", ["a", "b"])])
+    assert parser.analizar("aab") is None
+
+
+def test_earley_rechaza_gramaticas_no_libres_de_contexto():
+    with pytest.raises(ValueError):
+        ParserEarley(parsear_gramatica("S -> aSb | ab\naS -> b"))
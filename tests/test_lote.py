@@ -0,0 +1,43 @@
+import io
+import json
+import os
+
+import lote
+from ejemplos import obtener_ejemplo_automata
+
+
+def _salida(capsys):
+    return [json.loads(linea) for linea in capsys.readouterr().out.splitlines()]
+
+
+def test_lote_clasifica_archivos_y_directorios(tmp_path, capsys):
+    (tmp_path / "regular.txt").write_text("S -> aS | b", encoding="utf-8")
+    (tmp_path / "libre.gram").write_text("S -> aSb | ab", encoding="utf-8")
+    (tmp_path / "pila.json").write_text(obtener_ejemplo_automata(2), encoding="utf-8")
+    (tmp_path / "notas.md").write_text("ignorado", encoding="utf-8")
+    assert lote.main([str(tmp_path), "--procesos", "1", "--sin-explicacion"]) == 0
+    tipos = {os.path.basename(r["id"]): r["tipo"] for r in _salida(capsys)}
+    assert tipos == {"libre.gram": 2, "pila.json": 2, "regular.txt": 3}
+
+
+def test_lote_informa_errores_sin_detenerse(tmp_path, capsys):
+    ilegible = tmp_path / "binario.txt"
+    ilegible.write_bytes(b"\xff\xfe")
+    valida = tmp_path / "valida.txt"
+    valida.write_text("S -> a", encoding="utf-8")
+    rutas = [str(ilegible), str(tmp_path / "falta.json"), str(valida)]
+    assert lote.main(rutas + ["--procesos", "1"]) == 0
+    resultados = _salida(capsys)
+    assert [r["id"] for r in resultados] == rutas
+    assert "error" in resultados[0] and "error" in resultados[1]
+    assert resultados[2]["tipo"] == 3
+
+
+def test_lote_jsonl_con_lineas_invalidas(monkeypatch, capsys):
+    entrada = '{"id": "g", "gramatica": "S -> aSb | ab"}\nno es json\n{"automata": %s}\n' % obtener_ejemplo_automata(1).replace("\n", " ")
+    monkeypatch.setattr("sys.stdin", io.StringIO(entrada))
+    assert lote.main(["--jsonl", "-", "--procesos", "1"]) == 0
+    resultados = _salida(capsys)
+    assert resultados[0]["tipo"] == 2
+    assert resultados[1]["id"] == "linea 2" and "error" in resultados[1]
+    assert resultados[2]["id"] == "linea 3" and resultados[2]["tipo"] == 3
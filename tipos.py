@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+TYPE_LABELS = {
+    0: "Tipo 0 - Lenguaje Recursivamente Enumerable",
+    1: "Tipo 1 - Lenguaje Sensible al Contexto",
+    2: "Tipo 2 - Lenguaje Libre de Contexto",
+    3: "Tipo 3 - Lenguaje Regular",
+}
+
+@dataclass(eq=False)
+class ResultadoClasificacion:
+    tipo: int
+    etiqueta: str
+    explicacion: List[str]
+
+    def __eq__(self, otro) -> bool:
+        if not isinstance(otro, ResultadoClasificacion):
+            return NotImplemented
+        return (self.tipo, self.etiqueta, list(self.explicacion)) == (otro.tipo, otro.etiqueta, list(otro.explicacion))
+
+class ExplicacionPerezosa:
+    __slots__ = ("_generar", "_lineas")
+
+    def __init__(self, generar: Callable[[], List[str]]):
+        self._generar: Optional[Callable[[], List[str]]] = generar
+        self._lineas: Optional[List[str]] = None
+
+    def __call__(self) -> List[str]:
+        if self._lineas is None:
+            self._lineas = self._generar()
+            self._generar = None
+        return self._lineas
+
+    @property
+    def generada(self) -> bool:
+        return self._lineas is not None
+
+class ResultadoPerezoso(ResultadoClasificacion):
+    def __init__(self, tipo: int, etiqueta: str, explicacion: ExplicacionPerezosa):
+        self.tipo = tipo
+        self.etiqueta = etiqueta
+        self.perezosa = explicacion
+        self._explicacion: Optional[List[str]] = None
+
+    @property
+    def explicacion(self) -> List[str]:
+        if self._explicacion is None:
+            self._explicacion = list(self.perezosa())
+        return self._explicacion
+
+    @explicacion.setter
+    def explicacion(self, valor: List[str]) -> None:
+        self._explicacion = valor
+
+    @property
+    def generada(self) -> bool:
+        return self._explicacion is not None or self.perezosa.generada
+
+    def __reduce__(self):
+        return (ResultadoClasificacion, (self.tipo, self.etiqueta, self.explicacion))
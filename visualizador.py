@@ -1,71 +1,273 @@
+import collections
+import hashlib
+import threading
+
 from graphviz import Digraph
 
+import instrumentacion
+from automatas import indice_automata
 
-def dibujar_gramatica(producciones, ruta_salida_base: str) -> str:
-    dot = Digraph("Gramatica")
-    dot.attr(rankdir="LR")
 
-    nodos = set()
-    for izq, der in producciones:
-        nodos.add(str(izq))
-        if der == "" or str(der).lower() in ("epsilon", "eps", "e"):
-            nodos.add("epsilon")
-        else:
-            nodos.add(str(der))
+class CacheDiagramas:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entradas: "collections.OrderedDict[str, bytes]" = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
 
-    for n in nodos:
-        dot.node(str(n))
+    def obtener(self, clave: str):
+        with self._lock:
+            datos = self._entradas.get(clave)
+            if datos is None:
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return datos
 
-    for izq, der in producciones:
-        origen = str(izq)
-        if der == "" or str(der).lower() in ("epsilon", "eps", "e"):
-            destino = "epsilon"
-        else:
-            destino = str(der)
-        dot.edge(origen, destino)
+    def guardar(self, clave: str, datos: bytes) -> None:
+        with self._lock:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= len(anterior)
+            self._entradas[clave] = datos
+            self._bytes += len(datos)
+            while self._bytes > self.max_bytes and len(self._entradas) > 1:
+                _, viejo = self._entradas.popitem(last=False)
+                self._bytes -= len(viejo)
 
-    ruta_png = ruta_salida_base + ".png"
-    dot.render(ruta_salida_base, format="png", cleanup=True)
-    return ruta_png
+    def estadisticas(self):
+        return {
+            "entradas": len(self._entradas),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+        }
 
 
-def dibujar_automata(automata, ruta_salida_base: str) -> str:
-    dot = Digraph("Automata")
-    dot.attr(rankdir="LR")
+CACHE_DIAGRAMAS = CacheDiagramas()
+
+
+@instrumentacion.medido("visualizador.renderizar")
+def renderizar(dot: Digraph, formato: str = "png") -> bytes:
+    h = hashlib.sha256()
+    for parte in (dot.engine, formato, dot.source):
+        h.update(parte.encode("utf-8"))
+        h.update(b"\x00")
+    clave = h.hexdigest()
+    datos = CACHE_DIAGRAMAS.obtener(clave)
+    if datos is None:
+        datos = dot.pipe(format=formato)
+        CACHE_DIAGRAMAS.guardar(clave, datos)
+        if instrumentacion.ACTIVA:
+            instrumentacion.contar("visualizador.renderizar.cache_fallos")
+            instrumentacion.contar("visualizador.renderizar.bytes", len(datos))
+    elif instrumentacion.ACTIVA:
+        instrumentacion.contar("visualizador.renderizar.cache_aciertos")
+    return datos
+
+
+def _escribir(datos: bytes, ruta_salida_base: str, formato: str = "png") -> str:
+    ruta = ruta_salida_base + "." + formato
+    with open(ruta, "wb") as f:
+        f.write(datos)
+    return ruta
+
+
+UMBRAL_GRAFO_GRANDE = 60
+MAX_NODOS_DIAGRAMA = 300
+MAX_ALTERNATIVAS_ETIQUETA = 6
+
 
-    if isinstance(automata, dict):
-        estados = automata.get("estados", [])
-        estado_inicial = automata.get("estado_inicial")
-        estados_finales = set(automata.get("estados_finales", []))
-        transiciones = automata.get("transiciones", [])
+def _es_epsilon(der) -> bool:
+    return der == "" or str(der).lower() in ("epsilon", "eps", "e")
+
+
+def _atributos_grafo(dot: Digraph, nodos: int) -> None:
+    if nodos > UMBRAL_GRAFO_GRANDE:
+        dot.engine = "sfdp"
+        dot.attr(overlap="prism", splines="false", outputorder="edgesfirst")
+        dot.attr("node", fontsize="10", width="0.3", height="0.3")
     else:
-        estados = list(getattr(automata, "estados", []))
-        estado_inicial = getattr(automata, "estado_inicial", None)
-        estados_finales = set(getattr(automata, "estados_finales", []))
-        transiciones = getattr(automata, "transiciones", [])
-
-    for e in estados:
-        if e in estados_finales:
-            dot.node(str(e), shape="doublecircle")
+        dot.attr(rankdir="LR")
+
+
+def _vecindario(inicial, sucesores, profundidad, max_nodos: int):
+    visitados = {inicial: 0}
+    cola = collections.deque([inicial])
+    while cola:
+        actual = cola.popleft()
+        nivel = visitados[actual]
+        if profundidad is not None and nivel >= profundidad:
+            continue
+        for siguiente in sucesores.get(actual, ()):
+            if siguiente not in visitados:
+                if len(visitados) >= max_nodos:
+                    return visitados
+                visitados[siguiente] = nivel + 1
+                cola.append(siguiente)
+    return visitados
+
+
+def _etiqueta_conjunto(simbolos) -> str:
+    simbolos = sorted(simbolos)
+    if len(simbolos) > MAX_ALTERNATIVAS_ETIQUETA:
+        return ", ".join(simbolos[:MAX_ALTERNATIVAS_ETIQUETA]) + f", ... (+{len(simbolos) - MAX_ALTERNATIVAS_ETIQUETA})"
+    return ", ".join(simbolos)
+
+
+@instrumentacion.medido("visualizador.grafo_gramatica")
+def grafo_gramatica(producciones, compacto=None, profundidad=None, max_nodos: int = MAX_NODOS_DIAGRAMA) -> Digraph:
+    producciones = [(str(izq), "" if _es_epsilon(der) else str(der)) for izq, der in producciones]
+    nodos_simples = {izq for izq, _ in producciones} | {der or "epsilon" for _, der in producciones}
+    if compacto is None:
+        compacto = len(nodos_simples) > UMBRAL_GRAFO_GRANDE or profundidad is not None
+    if not compacto:
+        dot = Digraph("Gramatica")
+        dot.attr(rankdir="LR")
+        for n in nodos_simples:
+            dot.node(n)
+        for izq, der in producciones:
+            dot.edge(izq, der or "epsilon")
+        return dot
+
+    from analizador_gramatica import Produccion
+    from gramatica_compilada import compilar_gramatica
+
+    gramatica = compilar_gramatica([Produccion(izq, der) for izq, der in producciones])
+    nombres = gramatica.nombres
+    sucesores = {}
+    terminales = {}
+    for (origen, derecha), p in zip(producciones, gramatica.producciones):
+        internos = [nombres[x] for x in p.derecha if gramatica.no_terminal[x]]
+        destinos = sucesores.setdefault(origen, {})
+        if internos:
+            for nt in internos:
+                destinos.setdefault(nt, set()).add(derecha)
         else:
-            dot.node(str(e), shape="circle")
+            terminales.setdefault(origen, set()).add(derecha or "epsilon")
+
+    inicial = producciones[0][0] if producciones else None
+    visibles = _vecindario(inicial, sucesores, profundidad, max_nodos) if inicial is not None else {}
+    dot = Digraph("Gramatica")
+    _atributos_grafo(dot, len(visibles))
+    recortado = False
+    for nt in visibles:
+        dot.node(nt, shape="ellipse")
+        if nt in terminales:
+            dot.node("_t_" + nt, label=_etiqueta_conjunto(terminales[nt]), shape="box")
+            dot.edge(nt, "_t_" + nt)
+        for destino, derechas in sucesores.get(nt, {}).items():
+            if destino in visibles:
+                dot.edge(nt, destino, label=_etiqueta_conjunto(derechas))
+            else:
+                recortado = True
+    if recortado:
+        dot.node("_resto", label="...", shape="plaintext")
+        for nt in visibles:
+            if any(d not in visibles for d in sucesores.get(nt, {})):
+                dot.edge(nt, "_resto", style="dashed")
+    return dot
 
+
+def imagen_gramatica(producciones, formato: str = "png", compacto=None, profundidad=None) -> bytes:
+    return renderizar(grafo_gramatica(producciones, compacto=compacto, profundidad=profundidad), formato)
+
+
+def dibujar_gramatica(producciones, ruta_salida_base: str, compacto=None, profundidad=None) -> str:
+    return _escribir(imagen_gramatica(producciones, compacto=compacto, profundidad=profundidad), ruta_salida_base)
+
+
+def _datos_automata(automata):
+    indice = indice_automata(automata)
+    aristas = []
+    for t, origen, destino in zip(indice.transiciones, indice.origen, indice.destino):
+        if origen is not None and destino is not None:
+            aristas.append((str(origen), str(destino), str(t.get("simbolo", ""))))
+    return (
+        [str(e) for e in indice.estados_declarados],
+        indice.estado_inicial,
+        {str(e) for e in indice.estados_finales},
+        aristas,
+    )
+
+
+def _estados_sumidero(estados, estado_inicial, estados_finales, aristas):
+    salidas = {e: set() for e in estados}
+    for origen, destino, _ in aristas:
+        salidas.setdefault(origen, set()).add(destino)
+    return {
+        e
+        for e, destinos in salidas.items()
+        if e not in estados_finales and e != estado_inicial and destinos <= {e}
+    }
+
+
+@instrumentacion.medido("visualizador.grafo_automata")
+def grafo_automata(automata, compacto=None, profundidad=None, max_nodos: int = MAX_NODOS_DIAGRAMA) -> Digraph:
+    estados, estado_inicial, estados_finales, aristas = _datos_automata(automata)
     if estado_inicial is not None:
-        dot.node("ini", shape="point")
-        dot.edge("ini", str(estado_inicial))
+        estado_inicial = str(estado_inicial)
+    if compacto is None:
+        compacto = len(estados) > UMBRAL_GRAFO_GRANDE or profundidad is not None
+
+    if not compacto:
+        dot = Digraph("Automata")
+        dot.attr(rankdir="LR")
+        for e in estados:
+            dot.node(e, shape="doublecircle" if e in estados_finales else "circle")
+        if estado_inicial is not None:
+            dot.node("ini", shape="point")
+            dot.edge("ini", estado_inicial)
+        for origen, destino, simbolo in aristas:
+            dot.edge(origen, destino, label=simbolo)
+        return dot
 
-    for t in transiciones:
-        if isinstance(t, dict):
-            origen = t.get("origen")
-            destino = t.get("destino")
-            simbolo = t.get("simbolo", "")
+    sumideros = _estados_sumidero(estados, estado_inicial, estados_finales, aristas)
+    paralelas = {}
+    for origen, destino, simbolo in aristas:
+        if origen in sumideros or destino in sumideros:
+            continue
+        paralelas.setdefault((origen, destino), set()).add(simbolo)
+    sucesores = {}
+    for origen, destino in paralelas:
+        sucesores.setdefault(origen, []).append(destino)
+
+    if estado_inicial is not None:
+        visibles = _vecindario(estado_inicial, sucesores, profundidad, max_nodos)
+    else:
+        visibles = {e: 0 for e in estados[:max_nodos] if e not in sumideros}
+
+    dot = Digraph("Automata")
+    _atributos_grafo(dot, len(visibles))
+    for e in visibles:
+        dot.node(e, shape="doublecircle" if e in estados_finales else "circle")
+    if estado_inicial is not None:
+        dot.node("ini", shape="point")
+        dot.edge("ini", estado_inicial)
+    recortados = set()
+    for (origen, destino), simbolos in paralelas.items():
+        if origen not in visibles:
+            continue
+        if destino in visibles:
+            dot.edge(origen, destino, label=_etiqueta_conjunto(simbolos))
         else:
-            origen = getattr(t, "origen", None)
-            destino = getattr(t, "destino", None)
-            simbolo = getattr(t, "simbolo", "")
-        if origen is not None and destino is not None:
-            dot.edge(str(origen), str(destino), label=str(simbolo))
+            recortados.add(origen)
+    if recortados:
+        dot.node("_resto", label="...", shape="plaintext")
+        for origen in recortados:
+            dot.edge(origen, "_resto", style="dashed")
+    if sumideros:
+        dot.attr(label=f"{len(sumideros)} estado(s) sumidero omitido(s)")
+    return dot
+
+
+def imagen_automata(automata, formato: str = "png", compacto=None, profundidad=None) -> bytes:
+    return renderizar(grafo_automata(automata, compacto=compacto, profundidad=profundidad), formato)
+
 
-    ruta_png = ruta_salida_base + ".png"
-    dot.render(ruta_salida_base, format="png", cleanup=True)
-    return ruta_png
+def dibujar_automata(automata, ruta_salida_base: str, compacto=None, profundidad=None) -> str:
+    return _escribir(imagen_automata(automata, compacto=compacto, profundidad=profundidad), ruta_salida_base)